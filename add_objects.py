@@ -2,13 +2,14 @@ import logging
 import bpy
 from create_primitives import create_cone, create_sphere, create_cylinder, create_cube 
 from create_primitives import import_and_position_gltf_object
-from color_materials import create_colored_material
+from color_materials import create_colored_material, clear_material_cache
 
 logger = logging.getLogger("add_objects")
 
 
 def add_objects_to_scene(objects_dict, output_path, default_scale=(0.5, 0.5, 0.5), 
-                        add_materials=True, default_opacity=0.3, color_map=None):
+                        add_materials=True, default_opacity=0.3, color_map=None,
+                        export=True, export_format='GLTF_SEPARATE'):
     # Mapping of string names to creation functions
     shape_functions = {
         'cube': create_cube,
@@ -26,11 +27,12 @@ def add_objects_to_scene(objects_dict, output_path, default_scale=(0.5, 0.5, 0.5
             # Generate unique name for the object
             object_name = f"{shape_type.capitalize()}_{len(created_objects) + 1}"
 
-            # Create the object using the appropriate function
+            # Create the object using the appropriate function; linking is deferred until all are built
             obj = shape_functions[shape_type](
                 location=location,
                 scale=default_scale,
-                name=object_name
+                name=object_name,
+                link=False
             )
             # Add default material if requested
             if add_materials:
@@ -59,13 +61,21 @@ def add_objects_to_scene(objects_dict, output_path, default_scale=(0.5, 0.5, 0.5
         else:
             logger.warning(f"Warning: Unknown shape type '{shape_name}'. Supported types: {list(shape_functions.keys())}")
 
-    # Export the updated scene to the output GLTF
-    bpy.ops.export_scene.gltf(
-        filepath=output_path,
-        use_selection=False,
-        export_apply=True,
-        export_format='GLTF_SEPARATE'
-    )
+    # Link all new objects at once and evaluate the depsgraph a single time
+    collection = bpy.context.collection
+    for obj in created_objects.values():
+        if obj is not None:
+            collection.objects.link(obj)
+    bpy.context.view_layer.update()
+
+    # Export the updated scene to the output GLTF (nothing to write if no object was created)
+    if export and created_objects:
+        bpy.ops.export_scene.gltf(
+            filepath=output_path,
+            use_selection=False,
+            export_apply=True,
+            export_format=export_format
+        )
 
     return created_objects
 
@@ -73,11 +83,11 @@ def add_objects_to_scene(objects_dict, output_path, default_scale=(0.5, 0.5, 0.5
 def add_objects_to_scene_real(objects_dict, output_path, default_rotation=(0, 0, 0), 
                              default_scale=(1, 1, 1), gltf_base_path="./models/", 
                              clear_existing=False, file_extension=".gltf",
-                             add_materials=True, default_opacity=0.7, color_map=None):
+                             add_materials=True, default_opacity=0.7, color_map=None,
+                             export=True, export_format='GLTF_SEPARATE'):
     # Clear existing objects if requested
     if clear_existing:
-        bpy.ops.object.select_all(action='SELECT')
-        bpy.ops.object.delete(use_global=False)
+        bpy.data.batch_remove(ids=list(bpy.context.scene.objects))
         logger.info("Cleared existing objects from scene")
 
     created_objects = {}
@@ -140,12 +150,17 @@ def add_objects_to_scene_real(objects_dict, output_path, default_rotation=(0, 0,
             logger.error(f"Failed to add object '{object_id}' to scene")
 
     # Export the updated scene to the output GLTF
+    if not export:
+        return created_objects
+    if not created_objects:
+        logger.warning(f"No objects were added, skipping export to: {output_path}")
+        return created_objects
     try:
         bpy.ops.export_scene.gltf(
             filepath=output_path,
             use_selection=False,
             export_apply=True,
-            export_format='GLTF_SEPARATE'
+            export_format=export_format
         )
         logger.info(f"Scene exported successfully to: {output_path}")
     except Exception as e:
@@ -156,34 +171,12 @@ def add_objects_to_scene_real(objects_dict, output_path, default_rotation=(0, 0,
 
 def empty_scene():
     """Thoroughly clean up the Blender scene to avoid memory buildup"""
-    # Clear selection
-    bpy.ops.object.select_all(action='DESELECT')
-
-    # Select and remove all objects
-    bpy.ops.object.select_all(action='SELECT')
-    bpy.ops.object.delete()
-
-    # Clear mesh data that's no longer used
-    for mesh in bpy.data.meshes:
-        if mesh.users == 0:
-            bpy.data.meshes.remove(mesh)
-
-    # Clear materials
-    for material in bpy.data.materials:
-        if material.users == 0:
-            bpy.data.materials.remove(material)
-
-    # Clear other potential data types as needed
-    for block in bpy.data.textures:
-        if block.users == 0:
-            bpy.data.textures.remove(block)
-
-    for block in bpy.data.images:
-        if block.users == 0:
-            bpy.data.images.remove(block)
-
-    # Purge all orphan data
-    bpy.ops.outliner.orphans_purge(do_recursive=True)
+    # Remove all objects in one call
+    bpy.data.batch_remove(ids=list(bpy.data.objects))
+
+    # Purge everything left without users (meshes, materials, textures, images, ...)
+    bpy.ops.outliner.orphans_purge(do_recursive=True, do_local_ids=True, do_linked_ids=True)
+    clear_material_cache()
 
     # Optional: manually call Blender's undo system flush
     try:
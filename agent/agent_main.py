@@ -1,11 +1,12 @@
 import json
 import logging
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from prompts import VLM_SYSTEM_PROMPT, VLM_USER_PROMPT, LLM_SYSTEM_PROMPT, LLM_FIRST_TURN, LLM_INTERMEDIATE_TURN
 from utils import generate_jitter_offsets, format_message
-from belief_state import BeliefState
-from api_call_gpt import call_llm, call_vlm
-from api_call_gemini import call_llm, call_vlm
-from verifier import parse_answer, parse_answer_json
+from belief_state import BeliefState, AXIS_IDX, SIGN_IDX
+from backends import get_backend, backend_for_model
+from verifier import parse_answer, parse_answer_json, iter_answer_pairs
 
 
 logging.basicConfig(
@@ -17,13 +18,23 @@ logging.basicConfig(
 
 
 class Agent:
-    def __init__(self, model_name, tau: float = 0.9, kappa_min: float = 10):
+    def __init__(self, model_name, tau: float = 0.9, kappa_min: float = 10, max_workers: int = 8,
+                 backend: str = None, cache_perceptions: bool = False):
         self.belief = BeliefState()
         self.history = []
+        self._history_json = []  # serialized history entries, appended once per step
         self.model_name = model_name
+        # 'gpt' or 'gemini'; inferred from the model name unless given
+        self.backend = backend or backend_for_model(model_name)
+        self._call_llm, self._call_vlm = get_backend(self.backend)
         self.tau = tau
         self.kappa_min = kappa_min
+        self.max_workers = max_workers  # concurrent VLM requests per step
         self.steps = 1
+        # Reuse VLM answers for revisited views; off by default since it removes sampling noise
+        self.cache_perceptions = cache_perceptions
+        self._perceive_cache = {}
+        self._vlm_prompt_cache = {}
 
     def propose_view(self, central: str, target: str) -> dict:
         # Create system prompt
@@ -38,29 +49,45 @@ class Agent:
             )
         else:
             # Build state for intermediate turns
-            belief_state = self.belief.get_posterior()
             user_prompt = LLM_INTERMEDIATE_TURN.format(
                 tau=self.tau,
-                belief_state=json.dumps(belief_state),
-                history=json.dumps(self.history)
+                belief_state=self.belief.posterior_json(),
+                history='[' + ', '.join(self._history_json) + ']'
             )
 
         # Format messages and call LLM
         messages = format_message(sys_prompt, user_prompt)
-        response = call_llm(messages, model_name=self.model_name)
+        response = self._call_llm(messages, model_name=self.model_name)
         return response
 
-    def perceive(self, img_path, central: str, target: str, focus_axis):
-        user_prompt = VLM_USER_PROMPT.format(
-                target=target, 
-                central=central, 
+    def _vlm_prompts(self, central: str, target: str, focus_axis):
+        # The templates only depend on the objects and the focus axis, so format each combination once
+        key = (central, target, tuple(focus_axis))
+        prompts = self._vlm_prompt_cache.get(key)
+        if prompts is None:
+            user_prompt = VLM_USER_PROMPT.format(
+                target=target,
+                central=central,
             )
-        sys_prompt = VLM_SYSTEM_PROMPT.format(
-            axis=focus_axis,
-            target_object=target, 
-            central_object=central,)
+            sys_prompt = VLM_SYSTEM_PROMPT.format(
+                axis=focus_axis,
+                target_object=target,
+                central_object=central,
+            )
+            prompts = self._vlm_prompt_cache[key] = (sys_prompt, user_prompt)
+        return prompts
+
+    def perceive(self, img_path, central: str, target: str, focus_axis):
+        # central/target are fixed for a run, so the image and axis identify the query
+        key = (img_path, tuple(focus_axis))
+        if self.cache_perceptions and key in self._perceive_cache:
+            return self._perceive_cache[key]
+
+        sys_prompt, user_prompt = self._vlm_prompts(central, target, focus_axis)
         messages = format_message(sys_prompt, user_prompt)
-        response = call_vlm(messages, image_path=img_path, model_name=self.model_name)
+        response = self._call_vlm(messages, image_path=img_path, model_name=self.model_name)
+        if self.cache_perceptions:
+            self._perceive_cache[key] = response
         return response
 
     def run(self, central: str, target: str, env, jitter_size, max_steps=10) -> str:
@@ -71,6 +98,13 @@ class Agent:
         while self.steps < max_steps:
             logging.info(f"Step: {self.steps} -------------------------------------")
 
+            # shrink the jitter budget as axes resolve; nothing left to measure once all are confident
+            _, top_ps = self.belief.get_decision()
+            unresolved = sum(1 for A in 'XYZ' if top_ps[A] < self.tau)
+            if unresolved == 0:
+                break
+            m = max(1, jitter_size * unresolved // 3)
+
             logging.info("LLM proposal ---------------------------------------")
             llm_response = self.propose_view(central, target)
             logging.info(llm_response)
@@ -84,19 +118,25 @@ class Agent:
 
             focus_axis = action["axis"]
 
-            offsets = generate_jitter_offsets(m=jitter_size, r_az=3, r_el=3)
+            offsets = generate_jitter_offsets(m=m, r_az=3, r_el=3)
+            # Render the jittered views plus the center view in one batch
+            all_views = offsets + [(0, 0)]
+            paths = env.capture([az + daz for daz, _ in all_views], [el + del_ for _, del_ in all_views])
             # Collect VLM votes
-            axis_counts = {'X': {'+': 0, '0': 0, '-': 0}, 'Y': {'+': 0, '0': 0, '-': 0}, 'Z': {'+': 0, '0': 0, '-': 0}}
-            for daz, del_ in offsets + [(0, 0)]:
-                img_path = env.capture(az + daz, el + del_)
-                ans = self.perceive(img_path=img_path, central=central, target=target, focus_axis=focus_axis)
+            # rows X/Y/Z, columns +/0/-
+            axis_counts = np.zeros((3, 3), dtype=int)
+            # VLM calls are network-bound, so issue them concurrently
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                answers = list(pool.map(
+                    lambda p: self.perceive(img_path=p, central=central, target=target, focus_axis=focus_axis),
+                    paths))
+            for ans, (daz, del_) in zip(answers, all_views):
                 logging.info(f"VLM: {ans}")
-                # parse e.g. <answer>(+X, -Y, 0Z)</answer>
-                labels = parse_answer(ans)
-                for axis, sign in labels.items():
-                    axis_counts[axis][sign] += 1
+                # count e.g. <answer>(+X, -Y, 0Z)</answer> straight into the vote array
+                for sign, axis in iter_answer_pairs(ans):
+                    axis_counts[AXIS_IDX[axis], SIGN_IDX[sign]] += 1
                 if daz == 0 and del_ == 0:
-                    view_ans = labels
+                    view_ans = parse_answer(ans)
             logging.info("VLM results -------------------------------------------------")
             logging.info(axis_counts)
 
@@ -105,12 +145,14 @@ class Agent:
             logging.info("Condidence scores ------------------------------------------")
             logging.info(confidence_scores)
             # record history
-            self.history.append({
+            entry = {
                 "step": self.steps,
                 "view":   {"az": az, "el": el},
                 "answer": view_ans,
                 "confidence": confidence_scores
-            })
+            }
+            self.history.append(entry)
+            self._history_json.append(json.dumps(entry))
 
             logging.info("History so far----------------------------------------------")
             logging.info(self.history)
@@ -1,11 +1,18 @@
 import os
 import base64
+import mmap
 import mimetypes
+from functools import lru_cache
+import httpx
 from openai import OpenAI
 from typing import List, Dict
 
-# instantiate once
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# instantiate once; a shared keep-alive pool lets concurrent VLM calls reuse connections
+http_client = httpx.Client(
+    limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+    timeout=60.0,
+)
+client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"), http_client=http_client)
 
 
 def call_llm(
@@ -23,17 +30,30 @@ def call_llm(
     return resp.choices[0].message.content.strip()
 
 
-def local_image_to_data_url(image_path: str) -> str:
-    """
-    Convert a local image file to a base64-encoded data URL.
-    """
+@lru_cache(maxsize=256)
+def _encode(image_path: str, mtime_ns: int, size: int) -> str:
+    # mtime_ns/size are part of the cache key so a re-rendered file is re-encoded
     mime_type, _ = mimetypes.guess_type(image_path)
     mime_type = mime_type or "application/octet-stream"
     with open(image_path, "rb") as f:
-        b64 = base64.b64encode(f.read()).decode("utf-8")
+        if size == 0:  # mmap can't map an empty file
+            b64 = ""
+        else:
+            # encode straight from the page cache instead of copying the file into a bytes object first
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                b64 = base64.b64encode(mm).decode("utf-8")
     return f"data:{mime_type};base64,{b64}"
 
 
+def local_image_to_data_url(image_path: str) -> str:
+    """
+    Convert a local image file to a base64-encoded data URL.
+    Revisited images are served from an in-memory cache.
+    """
+    st = os.stat(image_path)
+    return _encode(image_path, st.st_mtime_ns, st.st_size)
+
+
 def call_vlm(
     messages: List[Dict[str, str]],
     image_path: str,
@@ -41,7 +61,7 @@ def call_vlm(
     temperature: float = 0.3,
     max_tokens: int = 500,
 ) -> str:
-    # convert image → data URL
+    # convert image → data URL (revisited images come from the cache)
     data_url = local_image_to_data_url(image_path)
 
     # locate last user message
@@ -67,4 +87,4 @@ def call_vlm(
         temperature=temperature,
         max_tokens=max_tokens,
     )
-    return resp.choices[0].message.content.strip()
\ No newline at end of file
+    return resp.choices[0].message.content.strip()
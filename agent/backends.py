@@ -0,0 +1,20 @@
+from typing import Callable, Tuple
+
+
+def get_backend(name: str) -> Tuple[Callable, Callable]:
+    """
+    Return (call_llm, call_vlm) for the given backend ('gpt' or 'gemini').
+    Only the chosen API module is imported, so the other client is never created.
+    """
+    if name == 'gemini':
+        from api_call_gemini import call_llm, call_vlm
+    elif name == 'gpt':
+        from api_call_gpt import call_llm, call_vlm
+    else:
+        raise ValueError(f"Unknown backend: {name}. Must be 'gpt' or 'gemini'")
+    return call_llm, call_vlm
+
+
+def backend_for_model(model_name: str) -> str:
+    """Pick the backend from the model name, e.g. gemini-2.5-pro -> 'gemini'."""
+    return 'gemini' if model_name.lower().startswith('gemini') else 'gpt'
@@ -1,86 +1,86 @@
-import math
+import numpy as np
+
+# Row/column layout of the (axes x signs) arrays used throughout
+AXES = ('X', 'Y', 'Z')
+SIGNS = ('+', '0', '-')
+AXIS_IDX = {A: i for i, A in enumerate(AXES)}
+SIGN_IDX = {s: j for j, s in enumerate(SIGNS)}
 
 
 class BeliefState:
     def __init__(self, lam: float = 1.0, gamma: float = 1.0, method: str = 'wilson'):
-        # Dirichlet priors alpha[A][s]
-        self.alpha = {A: {'+': lam, '0': lam, '-': lam} for A in ['X','Y','Z']}
+        # Dirichlet priors alpha[A][s], one row per axis
+        self.alpha = np.full((len(AXES), len(SIGNS)), lam, dtype=float)
         self.lam = lam
         self.gamma = gamma
         self.method = method
 
-    def _wilson_neff(self, counts: dict) -> float:
-        # Effective sample size
-        kplus, kzero, kminus = counts['+'], counts['0'], counts['-']
-        n = kplus + kzero + kminus
-        if n == 0:
-            return 0.0, 0.0
-        kmax = max(kplus, kzero, kminus)
-        phat = kmax / n
+    def _wilson_neff(self, counts: np.ndarray):
+        # Effective sample size per axis
+        n = counts.sum(axis=1)
+        safe_n = np.maximum(n, 1)
+        phat = counts.max(axis=1) / safe_n
         z = 1.96
-        lb = (phat + z*z/(2*n) - z * math.sqrt((phat*(1-phat))/n + (z*z)/(4*n*n)))
-        lb /= (1 + z*z/n)
+        lb = (phat + z*z/(2*safe_n) - z * np.sqrt((phat*(1-phat))/safe_n + (z*z)/(4*safe_n*safe_n)))
+        lb /= (1 + z*z/safe_n)
 
-        confidence = max(0.0, (max(lb, 1/3) - 1/3)/(2/3))**self.gamma
+        confidence = np.clip((np.maximum(lb, 1/3) - 1/3)/(2/3), 0.0, None)**self.gamma
+        confidence = np.where(n > 0, confidence, 0.0)
 
         # Effective sample size scaled by confidence
         neff = n * confidence
         return neff, confidence
 
-    def _entropy_neff(self, counts: dict) -> float:
-        kplus, kzero, kminus = counts['+'], counts['0'], counts['-']
-        n = kplus + kzero + kminus
-        if n == 0:
-            return 0.0, 0.0
-        p = [(counts[s] + self.lam)/(n + 3*self.lam) for s in ['+','0','-']]
-        H = -sum(pi * math.log(pi) for pi in p)
-        Hmax = math.log(3)
+    def _entropy_neff(self, counts: np.ndarray):
+        n = counts.sum(axis=1)
+        p = (counts + self.lam)/(n[:, None] + 3*self.lam)
+        H = -(p * np.log(p)).sum(axis=1)
+        Hmax = np.log(3)
 
-        confidence = ((1 - H/Hmax) ** self.gamma)
+        confidence = np.where(n > 0, (1 - H/Hmax) ** self.gamma, 0.0)
         neff = n * confidence
         return neff, confidence
 
-    def update(self, axis_counts: dict):
+    def update(self, axis_counts: np.ndarray):
         """
-        axis_counts: {'X':{'+':k,'0':k,'-':k}, 'Y':..., 'Z':...}
+        axis_counts: array of shape (3, 3), rows X/Y/Z, columns +/0/-
         Updates Dirichlet alpha with effective counts.
         """
-        confidence_scores = {}
-        for A in ['X', 'Y', 'Z']:
-            counts = axis_counts[A]
-            if self.method == 'wilson':
-                neff, confidence = self._wilson_neff(counts)
-            else:
-                neff, confidence = self._entropy_neff(counts)
-            
-            confidence_scores[A] = confidence
-
-            # smooth proportions
-            n = sum(counts.values())
-            if n > 0 and neff > 0:
-                p_hat = {s: (counts[s] + self.lam)/(n + 3*self.lam) for s in ['+', '0', '-']}
-                for s in ['+', '0', '-']:
-                    self.alpha[A][s] += neff * p_hat[s]
-
-        return confidence_scores
+        counts = np.asarray(axis_counts, dtype=float)
+        if self.method == 'wilson':
+            neff, confidence = self._wilson_neff(counts)
+        else:
+            neff, confidence = self._entropy_neff(counts)
+
+        # smooth proportions; axes without votes have neff == 0 and are left untouched
+        n = counts.sum(axis=1, keepdims=True)
+        p_hat = (counts + self.lam)/(n + 3*self.lam)
+        self.alpha += neff[:, None] * p_hat
+
+        return {A: float(confidence[i]) for i, A in enumerate(AXES)}
+
+    def _posterior(self) -> np.ndarray:
+        return self.alpha / self.alpha.sum(axis=1, keepdims=True)
 
     def get_posterior(self) -> dict:
         """Returns posterior mean P(A)[s]."""
-        post = {}
-        for A in ['X', 'Y', 'Z']:
-            ssum = sum(self.alpha[A].values())
-            post[A] = {s: self.alpha[A][s]/ssum for s in ['+','0','-']}
-        return post
+        post = self._posterior()
+        return {A: {s: float(post[i, j]) for j, s in enumerate(SIGNS)} for i, A in enumerate(AXES)}
+
+    def posterior_json(self) -> str:
+        """Same text as json.dumps(self.get_posterior()), built from the array directly."""
+        post = self._posterior().tolist()
+        rows = (
+            f'"{A}": {{' + ', '.join(f'"{s}": {p!r}' for s, p in zip(SIGNS, post[i])) + '}'
+            for i, A in enumerate(AXES)
+        )
+        return '{' + ', '.join(rows) + '}'
 
     def get_decision(self):
-        post = self.get_posterior()
-        decision = {}
-        top_ps = {}
-        for A in ['X', 'Y', 'Z']:
-            probs = post[A]
-            top_s, top_p = max(probs.items(), key=lambda x: x[1])
-            decision[A] = top_s
-            top_ps[A] = top_p
+        post = self._posterior()
+        top = post.argmax(axis=1)
+        decision = {A: SIGNS[top[i]] for i, A in enumerate(AXES)}
+        top_ps = {A: float(post[i, top[i]]) for i, A in enumerate(AXES)}
         return decision, top_ps
 
     def should_stop(self, tau: float = 0.9, kappa_min: float = 10) -> (bool, dict):
@@ -88,10 +88,7 @@ class BeliefState:
         Returns (stop_flag, decision_labels)
         stop if top-prob ≥ tau AND alpha-sum ≥ kappa_min for all axes.
         """
-        decision, top_ps = self.get_decision()
-        ok = True
-        for A in ['X', 'Y', 'Z']:
-            top_p = top_ps[A]
-            if not (top_p >= tau and sum(self.alpha[A].values()) >= kappa_min):
-                ok = False
-        return ok, decision
\ No newline at end of file
+        decision, _ = self.get_decision()
+        top_p = self._posterior().max(axis=1)
+        ok = bool((top_p >= tau).all() and (self.alpha.sum(axis=1) >= kappa_min).all())
+        return ok, decision
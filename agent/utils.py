@@ -1,4 +1,4 @@
-import random
+import numpy as np
 
 
 def generate_jitter_offsets(m: int, r_az: float, r_el: float) -> list:
@@ -6,12 +6,8 @@ def generate_jitter_offsets(m: int, r_az: float, r_el: float) -> list:
     Generate m random jitter offsets within ±r_az, ±r_el degrees.
     Returns list of (daz, del) pairs.
     """
-    offsets = []
-    for _ in range(m):
-        daz = random.uniform(-r_az, r_az)
-        del_ = random.uniform(-r_el, r_el)
-        offsets.append((daz, del_))
-    return offsets
+    arr = np.random.uniform(low=[-r_az, -r_el], high=[r_az, r_el], size=(m, 2))
+    return list(map(tuple, arr.tolist()))
 
 
 def format_message(sys_prompt, user_prompt):
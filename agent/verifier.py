@@ -1,11 +1,16 @@
 import re
 import json
-from typing import Dict
+from typing import Dict, Iterator, Tuple
 
+_ANSWER_RE = re.compile(r"<answer>\s*(.*?)\s*</answer>")
+_PAIR_RE = re.compile(r"([+\-0])([XYZ])")
+_JSON_ANSWER_RE = re.compile(r'<answer>(.*?)</answer>', re.DOTALL)
 
-def parse_answer(response: str) -> Dict[str, str]:
+
+def iter_answer_pairs(response: str) -> Iterator[Tuple[str, str]]:
+    """Yield (sign, axis) pairs from the <answer> block (or the whole string if untagged), first per axis."""
     # 1) pull out what's inside the tags (if present), else use full string
-    m = re.search(r"<answer>\s*(.*?)\s*</answer>", response)
+    m = _ANSWER_RE.search(response)
     content = m.group(1) if m else response.strip()
 
     # 2) strip parentheses
@@ -13,21 +18,22 @@ def parse_answer(response: str) -> Dict[str, str]:
     if content.startswith("(") and content.endswith(")"):
         content = content[1:-1]
 
-    # 3) split into parts and build dict
-    parts = [p.strip() for p in content.split(",") if p.strip()]
-    result: Dict[str, str] = {}
-    for part in parts:
-        # match a sign (+, -, or 0) followed by an axis letter
-        mm = re.match(r"^([+\-0])([XYZ])$", part)
-        if mm:
-            sign, axis = mm.groups()
-            result[axis] = sign
-    return result
+    # 3) each comma-separated part must be exactly a sign (+, -, or 0) followed by an axis letter
+    seen = set()
+    for part in content.split(","):
+        mm = _PAIR_RE.fullmatch(part.strip())
+        if mm and mm.group(2) not in seen:
+            seen.add(mm.group(2))
+            yield mm.group(1), mm.group(2)
+
+
+def parse_answer(response: str) -> Dict[str, str]:
+    return {axis: sign for sign, axis in iter_answer_pairs(response)}
 
 
 def parse_answer_json(llm_response: str) -> dict:
     # Extract content between <answer> and </answer>
-    match = re.search(r'<answer>(.*?)</answer>', llm_response, re.DOTALL)
+    match = _JSON_ANSWER_RE.search(llm_response)
 
     if not match:
         raise ValueError("No <answer>...</answer> tags found in response")
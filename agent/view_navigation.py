@@ -1,9 +1,11 @@
 import sys
 import os
+from typing import List
 from mathutils import Vector
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from render import render_scene
+from render import import_gltf, calculate_scene_center, focus_camera_and_render
+from add_objects import empty_scene
 
 
 class ViewNavigationEnv():
@@ -11,16 +13,39 @@ class ViewNavigationEnv():
         self.gltf_path = gltf_path
         self.object_id = object_id
         self.output_path = output_path
-    
-    def capture(self, azimuth, elevation):
+
+        # Load the scene once; capture() only moves the camera
+        try:
+            import_gltf(gltf_path)
+        except Exception as e:
+            raise ValueError(f"Error loading scene for {object_id}: {e}")
+        self.scene_center = calculate_scene_center()
+
+    def capture(self, azimuths: List[float], elevations: List[float]) -> List[str]:
+        # Render all (azimuth, elevation) pairs in a single pass over the loaded scene
         view_kwargs = {
-            'azimuths': [azimuth],
-            'elevations': [elevation]
+            'azimuths': azimuths,
+            'elevations': elevations,
+            'paired': True
         }
-        args = (self.output_path, self.object_id, self.gltf_path)
         coords_center = Vector((0, 0, 0))
-        render_scene(args, show_coords=True, show_grid=False, coords_center=coords_center, mode='3D', rotation_angle=0,
-                 vg_mode="sphere", **view_kwargs)
+        try:
+            focus_camera_and_render(output_dir=self.output_path, object_id=self.object_id,
+                                    mode='3D',
+                                    show_coordinates=True,
+                                    show_grid=False,
+                                    coords_center=coords_center,
+                                    rotation_angle=0,
+                                    vg_mode="sphere",
+                                    scene_center=self.scene_center,
+                                    **view_kwargs)
+        except Exception as e:
+            raise ValueError(f"Error rendering for {self.object_id}: {e}")
+
+        # Return image paths, one per pair
+        return [os.path.join(self.output_path, f"{self.object_id}_sphere_az{az:.2f}_el{el:.2f}.png")
+                for az, el in zip(azimuths, elevations)]
 
-        # Return image path
-        return os.path.join(self.output_path, f"{self.object_id}_sphere_az{int(azimuth):03d}_el{int(elevation):03d}.png")
\ No newline at end of file
+    def close(self):
+        """Drop the loaded scene and its orphaned data blocks."""
+        empty_scene()
@@ -2,13 +2,20 @@ import time
 import bpy
 import gc
 import logging
+import os
+import sys
+import multiprocessing
+from contextlib import contextmanager
 from add_objects import add_objects_to_scene, add_objects_to_scene_real
 from add_objects import empty_scene
 
 logger = logging.getLogger("bpy_execution")
 
 
-def execute_blender_task_direct(task, real_world=False, gltf_base_dir=None):
+def execute_blender_task_direct(task, real_world=False, gltf_base_dir=None, export=True,
+                                export_format='GLTF_SEPARATE'):
+    # export=False builds the scene without writing it out; 'GLB' writes a single binary file
+    # (output_path should then end in .glb)
     objects_dict, output_path, task_id, color_map, default_scale, default_opacity = task
     
     try:
@@ -30,7 +37,9 @@ def execute_blender_task_direct(task, real_world=False, gltf_base_dir=None):
                 gltf_base_path=gltf_base_dir,
                 add_materials=True,
                 default_opacity=default_opacity,
-                color_map=color_map
+                color_map=color_map,
+                export=export,
+                export_format=export_format
             )
         else:
             # Create the model using the add_objects_to_scene function
@@ -40,7 +49,9 @@ def execute_blender_task_direct(task, real_world=False, gltf_base_dir=None):
                 default_scale=default_scale,
                 add_materials=True,
                 default_opacity=default_opacity,
-                color_map=color_map
+                color_map=color_map,
+                export=export,
+                export_format=export_format
             )
         
         # Calculate elapsed time
@@ -69,7 +80,8 @@ def execute_blender_task_direct(task, real_world=False, gltf_base_dir=None):
         }
     
 
-def execute_blender_tasks_direct_sequential(blender_tasks, real_world=False, gltf_base_dir=None):
+def execute_blender_tasks_direct_sequential(blender_tasks, real_world=False, gltf_base_dir=None, on_task_done=None):
+    # on_task_done(task, result) is called as soon as each task finishes, e.g. to hand its gltf to a renderer
     if not blender_tasks:
         logger.info("No Blender tasks to execute")
         return {}
@@ -115,6 +127,9 @@ def execute_blender_tasks_direct_sequential(blender_tasks, real_world=False, glt
                     "message": error_msg,
                     "execution_time": task_duration
                 }
+
+            if on_task_done is not None:
+                on_task_done(task, results[task_id])
     
     except Exception as e:
         logger.error(f"Critical error in sequential execution: {e}")
@@ -131,4 +146,96 @@ def execute_blender_tasks_direct_sequential(blender_tasks, real_world=False, glt
                 f"{successes} successful, {failures} failed")
     logger.info(f"Average time per task: {total_time/len(blender_tasks):.2f} seconds")
     
-    return results
\ No newline at end of file
+    return results
+
+
+@contextmanager
+def _without_blender_script_paths():
+    # Importing bpy prepends Blender's <version>/scripts/* folders to sys.path, and spawned children
+    # inherit that path; there scripts/modules/bpy would shadow the real bpy module, so hide them while spawning
+    marker = os.path.join(f"{bpy.app.version[0]}.{bpy.app.version[1]}", "scripts")
+    saved = sys.path[:]
+    sys.path[:] = [p for p in saved if marker not in p]
+    try:
+        yield
+    finally:
+        sys.path[:] = saved
+
+
+def _init_blender_worker():
+    # Each worker process keeps its own resident bpy instance for all of its tasks
+    bpy.context.preferences.edit.use_global_undo = False
+
+
+def _init_pinned_worker(gpu_queue, initializer, initargs):
+    # Restrict this worker to one GPU before Cycles enumerates devices
+    os.environ["CUDA_VISIBLE_DEVICES"] = str(gpu_queue.get())
+    if initializer is not None:
+        initializer(*initargs)
+
+
+def blender_process_pool(num_workers, initializer=_init_blender_worker, initargs=(), gpu_ids=None):
+    """
+    Pool of 'spawn' worker processes, each with its own bpy. bpy is not thread-safe, so
+    parallel Blender work has to use processes, and spawn gives each worker a clean bpy
+    instead of a forked copy of the parent's scene.
+    With gpu_ids, the workers are spread round-robin over those GPUs via CUDA_VISIBLE_DEVICES.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    if gpu_ids:
+        gpu_queue = ctx.Queue()
+        for i in range(num_workers):
+            gpu_queue.put(gpu_ids[i % len(gpu_ids)])
+        initializer, initargs = _init_pinned_worker, (gpu_queue, initializer, initargs)
+    with _without_blender_script_paths():
+        return ctx.Pool(processes=num_workers, initializer=initializer, initargs=initargs)
+
+
+def _execute_blender_task_worker(args):
+    task, real_world, gltf_base_dir = args
+    result = execute_blender_task_direct(task, real_world=real_world, gltf_base_dir=gltf_base_dir)
+    # bpy objects can't cross the process boundary (and were freed by empty_scene), send names instead
+    if isinstance(result.get("result"), dict):
+        result["result"] = list(result["result"].keys())
+    return task[2], result
+
+
+def execute_blender_tasks_direct_parallel(blender_tasks, real_world=False, gltf_base_dir=None, num_workers=None):
+    """
+    Same as execute_blender_tasks_direct_sequential, but spreads the independent tasks over a pool of
+    worker processes. The "result" entry holds the created object names rather than the bpy objects.
+    """
+    if not blender_tasks:
+        logger.info("No Blender tasks to execute")
+        return {}
+
+    if num_workers is None:
+        num_workers = os.cpu_count() or 1
+    num_workers = max(1, min(num_workers, len(blender_tasks)))
+
+    logger.info(f"Executing {len(blender_tasks)} Blender tasks on {num_workers} worker processes...")
+
+    start_time = time.time()
+    results = {}
+
+    worker_args = [(task, real_world, gltf_base_dir) for task in blender_tasks]
+    with blender_process_pool(num_workers) as pool:
+        for task_id, result in pool.imap_unordered(_execute_blender_task_worker, worker_args):
+            results[task_id] = result
+            if result['status'] == 'success':
+                logger.info(f"✓ {result['message']}")
+            else:
+                logger.error(f"✗ {result['message']}")
+
+    # Keep the input task order
+    results = {task[2]: results[task[2]] for task in blender_tasks if task[2] in results}
+
+    # Summary
+    total_time = time.time() - start_time
+    successes = sum(1 for r in results.values() if r.get('status') == 'success')
+    failures = len(results) - successes
+
+    logger.info(f"Completed {len(blender_tasks)} Blender tasks in parallel in {total_time:.2f} seconds: "
+                f"{successes} successful, {failures} failed")
+
+    return results
@@ -1,91 +1,106 @@
 from typing import Dict, List, Tuple
-import random
+from functools import lru_cache
+import numpy as np
 import bpy
 
 
-def generate_color_map(objects_list: List[str], seed: int = None) -> Dict[str, Tuple[float, float, float]]:
+# Predefined colors (avoiding red, green, blue, yellow used for axes/origin)
+_AVAILABLE_COLORS = {
+    'purple': (0.6, 0.2, 0.8),
+    'orange': (1.0, 0.5, 0.0),
+    'pink': (1.0, 0.4, 0.7),
+    'cyan': (0.0, 0.8, 0.8),
+    'magenta': (0.8, 0.0, 0.8),
+    'lime': (0.5, 1.0, 0.0),
+    'brown': (0.6, 0.3, 0.1),
+    'teal': (0.0, 0.5, 0.5),
+    'indigo': (0.3, 0.0, 0.5),
+    'coral': (1.0, 0.5, 0.3),
+    'lavender': (0.9, 0.6, 1.0),
+    'olive': (0.5, 0.5, 0.0),
+    'navy': (0.0, 0.0, 0.5),
+    'maroon': (0.5, 0.0, 0.0),
+    'turquoise': (0.3, 0.8, 0.8),
+}
+_COLOR_NAME_LIST = tuple(_AVAILABLE_COLORS)
+_COLOR_RGBS = tuple(_AVAILABLE_COLORS.values())
+_RGB_TO_NAME = {rgb: name for name, rgb in _AVAILABLE_COLORS.items()}
+
+
+def generate_color_map(objects_list: List[str], seed: int = None,
+                       rng: np.random.Generator = None) -> Dict[str, Tuple[float, float, float]]:
     """
     Generates a color map by randomly assigning predefined colors to objects.
     
     Args:
         objects_list: List of object names/types to generate colors for
-        seed: Random seed for reproducible colors (optional)
+        seed: Random seed for reproducible colors (optional, ignored if rng is given)
+        rng: NumPy Generator to draw from, so callers can seed once for many maps (optional)
     
     Returns:
         Dict mapping object names to RGB tuples (values 0.0-1.0)
     """
-    if seed is not None:
-        random.seed(seed)
-    
-    # Predefined colors (avoiding red, green, blue, yellow used for axes/origin)
-    available_colors = {
-        'purple': (0.6, 0.2, 0.8),
-        'orange': (1.0, 0.5, 0.0),
-        'pink': (1.0, 0.4, 0.7),
-        'cyan': (0.0, 0.8, 0.8),
-        'magenta': (0.8, 0.0, 0.8),
-        'lime': (0.5, 1.0, 0.0),
-        'brown': (0.6, 0.3, 0.1),
-        'teal': (0.0, 0.5, 0.5),
-        'indigo': (0.3, 0.0, 0.5),
-        'coral': (1.0, 0.5, 0.3),
-        'lavender': (0.9, 0.6, 1.0),
-        'olive': (0.5, 0.5, 0.0),
-        'navy': (0.0, 0.0, 0.5),
-        'maroon': (0.5, 0.0, 0.0),
-        'turquoise': (0.3, 0.8, 0.8),
-    }
+    if rng is None:
+        rng = np.random.default_rng(seed)
     
-    color_names = list(available_colors.keys())
+    num_colors = len(_COLOR_RGBS)
+    objects_list = list(objects_list)
     
-    # Shuffle colors for random assignment
-    random.shuffle(color_names)
+    if len(objects_list) <= num_colors:
+        # Distinct colors, drawn uniformly from the whole palette
+        picks = rng.choice(num_colors, size=len(objects_list), replace=False)
+        return {obj_name: _COLOR_RGBS[k] for obj_name, k in zip(objects_list, picks)}
     
-    color_map = {}
-    for i, obj_name in enumerate(objects_list):
-        # Cycle through colors if we have more objects than colors
-        color_name = color_names[i % len(color_names)]
-        color_map[obj_name] = available_colors[color_name]
+    # Random assignment order over the palette
+    perm = rng.permutation(num_colors)
     
-    return color_map
+    # Cycle through colors if we have more objects than colors
+    return {obj_name: _COLOR_RGBS[perm[i % len(perm)]] for i, obj_name in enumerate(objects_list)}
+
+
+# Nearest palette index for every cell of a 32x32x32 RGB grid, built on the first non-palette color
+_LUT_SIZE = 32
+_PALETTE = np.array(_COLOR_RGBS, dtype=np.float32)
+_COLOR_LUT = None
+
+
+def _build_color_lut() -> np.ndarray:
+    axis = (np.arange(_LUT_SIZE, dtype=np.float32) + 0.5) / _LUT_SIZE
+    cells = np.stack(np.meshgrid(axis, axis, axis, indexing='ij'), axis=-1).reshape(-1, 3)
+    # squared distance |c|^2 - 2 c.p + |p|^2 as one matmul; |c|^2 is the same for every p, so skip it
+    dist = (_PALETTE * _PALETTE).sum(1)[None, :] - 2.0 * (cells @ _PALETTE.T)
+    return dist.argmin(1).astype(np.uint8)
+
+
+def _nearest_slow(rgb_tuple):
+    # Look up the nearest palette color of the RGB cell; only reached for colors outside the palette
+    global _COLOR_LUT
+    try:
+        r, g, b = (min(max(int(c * _LUT_SIZE), 0), _LUT_SIZE - 1) for c in rgb_tuple[:3])
+    except (TypeError, ValueError):
+        return 'colored'
+    if _COLOR_LUT is None:
+        _COLOR_LUT = _build_color_lut()
+    return _COLOR_NAME_LIST[_COLOR_LUT[(r << 10) | (g << 5) | b]]
 
 
+@lru_cache(maxsize=None)
 def get_color_name_from_rgb(rgb_tuple):
-    # Predefined color names mapping (should match your color generation function)
-    color_names = {
-        (0.6, 0.2, 0.8): 'purple',
-        (1.0, 0.5, 0.0): 'orange', 
-        (1.0, 0.4, 0.7): 'pink',
-        (0.0, 0.8, 0.8): 'cyan',
-        (0.8, 0.0, 0.8): 'magenta',
-        (0.5, 1.0, 0.0): 'lime',
-        (0.6, 0.3, 0.1): 'brown',
-        (0.0, 0.5, 0.5): 'teal',
-        (0.3, 0.0, 0.5): 'indigo',
-        (1.0, 0.5, 0.3): 'coral',
-        (0.9, 0.6, 1.0): 'lavender',
-        (0.5, 0.5, 0.0): 'olive',
-        (0.0, 0.0, 0.5): 'navy',
-        (0.5, 0.0, 0.0): 'maroon',
-        (0.3, 0.8, 0.8): 'turquoise',
-    }
-    
-    # Find closest color match (simple exact match first, then closest)
-    if rgb_tuple in color_names:
-        return color_names[rgb_tuple]
-    
-    # If no exact match, find closest RGB values
-    min_distance = float('inf')
-    closest_color = 'colored'
-    
-    for color_rgb, color_name in color_names.items():
-        # Calculate Euclidean distance in RGB space
-        distance = sum((a - b) ** 2 for a, b in zip(rgb_tuple, color_rgb)) ** 0.5
-        if distance < min_distance:
-            min_distance = distance
-            closest_color = color_name
-    
-    return closest_color
+    # rgb_tuple must be hashable (pass a tuple, not a list); repeated colors are answered from the cache
+    # Palette colors (everything generate_color_map hands out) are a single dict hit
+    name = _RGB_TO_NAME.get(rgb_tuple)
+    return name if name is not None else _nearest_slow(rgb_tuple)
+
+
+# (part_name, opacity) -> material, so repeated parts skip the bpy.data name lookup
+_MATERIAL_CACHE = {}
+# (part_name, opacity) -> material name; plain strings, so unlike the materials it survives scene purges
+_MAT_NAME_CACHE: Dict[Tuple[str, float], str] = {}
+
+
+def clear_material_cache():
+    """Forget cached materials; call whenever the scene's data blocks are purged."""
+    _MATERIAL_CACHE.clear()
 
 
 def create_colored_material(part_name, color_map, opacity=0.5):
@@ -101,8 +116,19 @@ def create_colored_material(part_name, color_map, opacity=0.5):
     Returns:
         Blender material object
     """
+    cache_key = (part_name, round(opacity, 2))
+    mat = _MATERIAL_CACHE.get(cache_key)
+    if mat is not None:
+        try:
+            mat.name  # raises ReferenceError if the material was removed behind our back
+            return mat
+        except ReferenceError:
+            del _MATERIAL_CACHE[cache_key]
+
     # Generate material name based on part name and opacity
-    mat_name = f"Material_{part_name}_{opacity:.2f}"
+    mat_name = _MAT_NAME_CACHE.get(cache_key)
+    if mat_name is None:
+        mat_name = _MAT_NAME_CACHE.setdefault(cache_key, f"Material_{part_name}_{opacity:.2f}")
     
     # Get color from mapping, default to gray if not found
     if part_name in color_map:
@@ -137,4 +163,5 @@ def create_colored_material(part_name, color_map, opacity=0.5):
             mat.blend_method = 'BLEND'
             mat.use_backface_culling = False
     
+    _MATERIAL_CACHE[cache_key] = mat
     return mat
\ No newline at end of file
@@ -1,98 +1,130 @@
 import bpy
+import bmesh
 import logging
-from mathutils import Vector, Euler
+from functools import lru_cache
+from mathutils import Vector, Euler, Matrix
 import os
 
 logger = logging.getLogger("create_primitives")
 
 
-def create_cube(location=(0, 0, 0), scale=(1, 1, 1), name="Cube"):
-    bpy.ops.mesh.primitive_cube_add(location=location, scale=scale)
-    cube = bpy.context.active_object
-    cube.name = name
+# Template geometry, built once per (shape, parameters) and copied into each new mesh
+_BMESH_TEMPLATES = {}
+
+
+def get_template(shape, **params):
+    """
+    Shared bmesh template for a primitive, built on first use; shared with visual_enhance.
+    radius defaults to 1, for callers that size the object by its scale instead; 'arrow' is a
+    cylinder shaft from z=0 to z=depth with a cone of head_radius/head_depth on top.
+    """
+    key = (shape, tuple(sorted(params.items())))
+    bm = _BMESH_TEMPLATES.get(key)
+    if bm is None:
+        radius = params.get('radius', 1.0)
+        bm = bmesh.new()
+        bm.loops.layers.uv.new("UVMap")
+        if shape == 'cube':
+            bmesh.ops.create_cube(bm, size=2.0, calc_uvs=True)
+        elif shape == 'sphere':
+            bmesh.ops.create_uvsphere(bm, u_segments=params['segments'], v_segments=params['ring_count'],
+                                      radius=radius, calc_uvs=True)
+        elif shape in ('cone', 'cylinder'):
+            radius2 = 0.0 if shape == 'cone' else radius
+            bmesh.ops.create_cone(bm, cap_ends=True, cap_tris=False, segments=params['vertices'],
+                                  radius1=radius, radius2=radius2, depth=params['depth'], calc_uvs=True)
+        elif shape == 'arrow':
+            bmesh.ops.create_cone(bm, cap_ends=True, cap_tris=False, segments=params['vertices'],
+                                  radius1=radius, radius2=radius, depth=params['depth'],
+                                  matrix=Matrix.Translation((0, 0, params['depth'] / 2)), calc_uvs=True)
+            bmesh.ops.create_cone(bm, cap_ends=True, cap_tris=False, segments=params['vertices'],
+                                  radius1=params['head_radius'], radius2=0.0, depth=params['head_depth'],
+                                  matrix=Matrix.Translation((0, 0, params['depth'] + params['head_depth'] / 2)),
+                                  calc_uvs=True)
+        else:
+            raise ValueError(f"Unknown primitive: {shape}")
+        _BMESH_TEMPLATES[key] = bm
+    return bm
+
+
+def _new_mesh_object(name, bm, location, scale, link=True):
+    """Create a mesh object from template geometry without going through bpy.ops.
+    With link=False the caller links it, so bulk creation can link everything at once."""
+    mesh = bpy.data.meshes.new(name)
+    bm.to_mesh(mesh)
+    obj = bpy.data.objects.new(name, mesh)
+    obj.location = location
+    obj.scale = scale
+    if link:
+        bpy.context.collection.objects.link(obj)
+    return obj
+
+
+def create_cube(location=(0, 0, 0), scale=(1, 1, 1), name="Cube", link=True):
+    cube = _new_mesh_object(name, get_template('cube'), location, scale, link)
     return cube
 
 
-def create_sphere(location=(0, 0, 0), scale=(1, 1, 1), name="Sphere", subdivisions=2):
+def create_sphere(location=(0, 0, 0), scale=(1, 1, 1), name="Sphere", subdivisions=2, link=True):
     try:
-        # Create sphere with correct parameters
-        bpy.ops.mesh.primitive_uv_sphere_add(
-            location=location,
-            segments=32,      # CORRECT: longitude segments
-            ring_count=16     # CORRECT: latitude rings
-        )
-        
-        sphere = bpy.context.active_object
-        if sphere is None:
-            logger.warning("Error: No active object after sphere creation")
-            return None
-            
-        sphere.name = name
-        
-        # Apply scale after creation (not during creation)
-        sphere.scale = scale
+        # 32 longitude segments, 16 latitude rings
+        sphere = _new_mesh_object(name, get_template('sphere', segments=32, ring_count=16), location, scale, link)
         
         # Add subdivision surface modifier for smoothness if requested
         if subdivisions > 0:
             modifier = sphere.modifiers.new(name="Subdivision", type='SUBSURF')
             modifier.levels = subdivisions
         
-        logger.info(f"Successfully created sphere '{name}' at {location}")
+        logger.info("Successfully created sphere '%s' at %s", name, location)
         return sphere
         
     except Exception as e:
-        logger.warning(f"Error creating sphere '{name}': {str(e)}")
+        logger.warning("Error creating sphere '%s': %s", name, e)
         return None
 
 
-def create_cone(location=(0, 0, 0), scale=(1, 1, 1), name="Cone", vertices=32, depth=2.0):
+def create_cone(location=(0, 0, 0), scale=(1, 1, 1), name="Cone", vertices=32, depth=2.0, link=True):
     try:
-        bpy.ops.mesh.primitive_cone_add(
-            location=location,
-            vertices=vertices,
-            depth=depth
-        )
+        cone = _new_mesh_object(name, get_template('cone', vertices=vertices, depth=depth), location, scale, link)
         
-        cone = bpy.context.active_object
-        cone.name = name
-        cone.scale = scale
-        
-        logger.info(f"Successfully created cone '{name}' at {location}")
+        logger.info("Successfully created cone '%s' at %s", name, location)
         return cone
         
     except Exception as e:
-        logger.warning(f"Error creating cone '{name}': {str(e)}")
+        logger.warning("Error creating cone '%s': %s", name, e)
         return None
 
 
-def create_cylinder(location=(0, 0, 0), scale=(1, 1, 1), name="Cylinder", vertices=32, depth=2.0):
+def create_cylinder(location=(0, 0, 0), scale=(1, 1, 1), name="Cylinder", vertices=32, depth=2.0, link=True):
     try:
-        bpy.ops.mesh.primitive_cylinder_add(
-            location=location,
-            vertices=vertices,
-            depth=depth
-        )
-        
-        cylinder = bpy.context.active_object
-        cylinder.name = name
-        cylinder.scale = scale
+        cylinder = _new_mesh_object(name, get_template('cylinder', vertices=vertices, depth=depth), location, scale, link)
         
-        logger.info(f"Successfully created cylinder '{name}' at {location}")
+        logger.info("Successfully created cylinder '%s' at %s", name, location)
         return cylinder
         
     except Exception as e:
-        logger.warning(f"Error creating cylinder '{name}': {str(e)}")
+        logger.warning("Error creating cylinder '%s': %s", name, e)
         return None
 
 
+@lru_cache(maxsize=None)
+def _list_gltf_dir(base_path):
+    """File names in a model directory, listed once; the model library doesn't change during a run."""
+    try:
+        with os.scandir(base_path) as entries:
+            return frozenset(entry.name for entry in entries if entry.is_file())
+    except FileNotFoundError:
+        return frozenset()
+
+
 def import_and_position_gltf_object(object_id, position, gltf_base_path, rotation=(0, 0, 0), scale=(1, 1, 1), 
                                    file_extension=".gltf"):
     # Construct the full file path
     gltf_file_path = os.path.join(gltf_base_path, f"{object_id}{file_extension}")
     
     # Check if file exists
-    if not os.path.exists(gltf_file_path):
-        logger.error(f"GLTF file not found: {gltf_file_path}")
+    if f"{object_id}{file_extension}" not in _list_gltf_dir(gltf_base_path):
+        logger.error("GLTF file not found: %s", gltf_file_path)
         return None
     
     # Store current objects to identify newly imported ones
@@ -101,10 +133,10 @@ def import_and_position_gltf_object(object_id, position, gltf_base_path, rotatio
     try:
         # Import the GLTF file
         bpy.ops.import_scene.gltf(filepath=gltf_file_path)
-        logger.info(f"Successfully imported GLTF: {gltf_file_path}")
+        logger.info("Successfully imported GLTF: %s", gltf_file_path)
         
     except Exception as e:
-        logger.error(f"Failed to import GLTF file {gltf_file_path}: {str(e)}")
+        logger.error("Failed to import GLTF file %s: %s", gltf_file_path, e)
         return None
     
     # Find newly imported objects (all parts of the object)
@@ -112,43 +144,39 @@ def import_and_position_gltf_object(object_id, position, gltf_base_path, rotatio
     imported_objects = list(objects_after - objects_before)
     
     if not imported_objects:
-        logger.warning(f"No objects were imported from {gltf_file_path}")
+        logger.warning("No objects were imported from %s", gltf_file_path)
         return None
     
-    logger.info(f"Imported {len(imported_objects)} parts for object '{object_id}': {[obj.name for obj in imported_objects]}")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Imported %d parts for object '%s': %s", len(imported_objects), object_id,
+                    [obj.name for obj in imported_objects])
     
     # Create a parent empty object to control all parts of the imported model
     parent_name = f"{object_id}"
-    bpy.ops.object.empty_add(type='PLAIN_AXES', location=(0, 0, 0))
-    parent_obj = bpy.context.active_object
-    parent_obj.name = parent_name
-    
-    # Clear selection
-    bpy.ops.object.select_all(action='DESELECT')
+    parent_obj = bpy.data.objects.new(parent_name, None)
+    parent_obj.empty_display_type = 'PLAIN_AXES'
+    bpy.context.collection.objects.link(parent_obj)
     
-    # Parent all imported objects (parts) to the empty parent
+    # Parent all imported objects (parts) to the empty parent, keeping their world transforms
+    parent_inverse = parent_obj.matrix_world.inverted()
     for obj in imported_objects:
-        # Select the object to be parented
-        obj.select_set(True)
-        
-    # Select the parent object last (it will be the active object)
-    parent_obj.select_set(True)
-    bpy.context.view_layer.objects.active = parent_obj
-    
-    # Set parent for all selected objects (all parts) with keep transform
-    bpy.ops.object.parent_set(type='OBJECT', keep_transform=True)
+        world = obj.matrix_world.copy()
+        obj.parent = parent_obj
+        obj.matrix_parent_inverse = parent_inverse
+        obj.matrix_world = world
+        # Clear the selection left behind by the importer
+        obj.select_set(False)
     
-    logger.info(f"Parented {len(imported_objects)} parts to '{parent_name}'")
+    logger.info("Parented %d parts to '%s'", len(imported_objects), parent_name)
     
     # Apply transformations to the parent object (this moves all parts together)
     parent_obj.location = Vector(position)
     parent_obj.rotation_euler = Euler(rotation, 'XYZ')
     parent_obj.scale = Vector(scale)
+    bpy.context.view_layer.update()
     
-    logger.info(f"Parent scale set to: {parent_obj.scale}")
-    # Clear selection
-    bpy.ops.object.select_all(action='DESELECT')
+    logger.info("Parent scale set to: %s", parent_obj.scale)
     
-    logger.info(f"Positioned {object_id} at {position} with rotation {rotation} and scale {scale}")
+    logger.info("Positioned %s at %s with rotation %s and scale %s", object_id, position, rotation, scale)
     
     return parent_obj
\ No newline at end of file
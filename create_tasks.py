@@ -1,16 +1,19 @@
 import os
 import logging
 import random
+import numpy as np
 from datetime import datetime
 import csv
 import time
 from mathutils import Vector
 from utils_task import sample_random_objects, sample_random_shapes
-from utils_task import generate_random_axes, generate_random_positions
+from utils_task import generate_random_axes, generate_random_positions_batch
 from color_materials import generate_color_map
-from bpy_execution import execute_blender_tasks_direct_sequential
+from bpy_execution import execute_blender_tasks_direct_sequential, execute_blender_tasks_direct_parallel
+from bpy_execution import blender_process_pool
 from prompt_generation import generate_vlm_test_question, generate_vlm_test_questions_multiagent
-from render import render_scene_sequential
+from render import render_scene_sequential, render_scene_parallel
+from render import render_scene_worker, worker_render_kwargs
 
 
 logger = logging.getLogger("create_tasks")
@@ -25,14 +28,20 @@ def create_experiment(output_dir, num_shapes=2, exp_size=5,
     # Set random seed if provided
     if seed is not None:
         random.seed(seed)
-        logger.info(f"Random seed set to: {seed}")
+        logger.info("Random seed set to: %s", seed)
+    
+    # One generator for all positions and color maps, seeded once instead of reseeding per task
+    rng = np.random.default_rng(seed)
     
     blender_tasks = []
     qa_tuples = []
     
+    # Create output directory
+    os.makedirs(output_dir, exist_ok=True)
+    
+    # Sample the objects and free axes of every task first, so all positions can be drawn in one batch
+    task_layouts = []
     for i in range(exp_size):
-        task_id = f"task_{i+1}"
-        output_path = os.path.join(output_dir, f"{task_id}.gltf")
         if real_world:
             sampled_shapes = sample_random_objects(gltf_base_dir=gltf_base_dir, 
                                                    categories=categories, 
@@ -40,40 +49,47 @@ def create_experiment(output_dir, num_shapes=2, exp_size=5,
         else:
             sampled_shapes = sample_random_shapes(num_shapes=num_shapes)
         
-        # Create output directory
-        os.makedirs(output_dir, exist_ok=True)
-        
-        # Choose central object (where coordinate axes will be placed)
-        central_object_type = random.choice(sampled_shapes)
-        other_object_types = [shape for shape in sampled_shapes if shape != central_object_type]
-        
-        # Position central object at origin
-        central_position = (0, 0, 0)
-        
+        # Choose central object (where coordinate axes will be placed); the rest are placed around it
+        shuffled = random.sample(sampled_shapes, len(sampled_shapes))
         dof_axes = generate_random_axes(degree_of_freedom=dof)
-
-        # Generate random positions for other objects
-        objects_dict = generate_random_positions(
-            objects=other_object_types,
-            axes=dof_axes,
-            center=central_position,
-            radius=radius,
-        )
-        logger.info(objects_dict)
+        task_layouts.append((shuffled[0], shuffled[1:], dof_axes))
+    
+    # Position central object at origin
+    central_position = (0, 0, 0)
+    
+    # Generate random positions for the other objects of all tasks
+    positions_per_task = generate_random_positions_batch(
+        objects_per_task=[other_object_types for _, other_object_types, _ in task_layouts],
+        axes_per_task=[dof_axes for _, _, dof_axes in task_layouts],
+        center=central_position,
+        radius=radius,
+        rng=rng,
+    )
+    
+    # Checked once, so the per-task dumps below cost nothing when INFO is filtered out
+    log_tasks = logger.isEnabledFor(logging.INFO)
+    
+    for i, ((central_object_type, _, _), objects_dict) in enumerate(zip(task_layouts, positions_per_task)):
+        task_id = f"task_{i+1}"
+        output_path = os.path.join(output_dir, f"{task_id}.gltf")
+        if log_tasks:
+            logger.info(objects_dict)
         # Add central object to the objects dictionary
         objects_dict[f"{central_object_type}"] = central_position
         
         if colors:
-            color_map = generate_color_map(objects_list=objects_dict.keys(), seed=seed)
+            color_map = generate_color_map(objects_list=objects_dict.keys(), rng=rng)
         else:
             color_map = None
-        logger.info(color_map)
+        if log_tasks:
+            logger.info(color_map)
 
         # Create blender task tuple
         blender_task = (objects_dict, output_path, task_id, color_map, scale, opacity)
         blender_tasks.append(blender_task)
 
-        logger.info(blender_task)
+        if log_tasks:
+            logger.info(blender_task)
         
         # Create experiment configuration for VLM question generation
         experiment_config = {
@@ -154,39 +170,37 @@ def save_multiagent_qa_tuples_to_csv(qa_tuples, output_dir, csv_filename=None):
         'full_expected_answer'
     ]
     
-    with open(csv_path, 'w', newline='', encoding='utf-8') as csvfile:
+    rows = [
+        {
+            'task_id': qa_dict['task_id'],
+            'front_question': qa_dict['front_view']['question'],
+            'side_question': qa_dict['side_view']['question'],
+            'top_question': qa_dict['top_view']['question'],
+            'full_expected_answer': qa_dict['full_expected_answer']
+        }
+        for qa_dict in qa_tuples
+    ]
+    
+    with open(csv_path, 'w', newline='', encoding='utf-8', buffering=1 << 20) as csvfile:
         writer = csv.DictWriter(csvfile, fieldnames=headers)
         writer.writeheader()
-        
-        for qa_dict in qa_tuples:
-            row = {
-                'task_id': qa_dict['task_id'],
-                'front_question': qa_dict['front_view']['question'],
-                'side_question': qa_dict['side_view']['question'],
-                'top_question': qa_dict['top_view']['question'],
-                'full_expected_answer': qa_dict['full_expected_answer']
-            }
-            writer.writerow(row)
+        writer.writerows(rows)
     
-    logger.info(f"Multi-agent Q&A pairs saved to: {csv_path}")
+    logger.info("Multi-agent Q&A pairs saved to: %s", csv_path)
     return csv_path
 
 
 def prepare_experiment(blender_tasks, image_base_dir, show_coords=True, show_grid=True, mode='3D',
                        rotation_angle=0, 
                        real_world=True, gltf_base_dir=None,
-                       vg_mode='circle', **view_kwargs):
+                       vg_mode='circle', num_workers=None, pipeline=False, gpu_ids=None, **view_kwargs):
+    # num_workers > 1 runs the (independent) build and render tasks in that many worker processes,
+    # gpu_ids spreads the render workers over those GPUs
+    parallel = num_workers is not None and num_workers > 1
+    # pipeline renders task i in a separate Blender process while task i+1 is being built
+    pipeline = pipeline and not parallel
     experiment_start_time = time.time()
     
-    # Execute blender tasks
-    blender_start_time = time.time()
-    
-    results = execute_blender_tasks_direct_sequential(blender_tasks=blender_tasks, real_world=real_world,
-                                                      gltf_base_dir=gltf_base_dir)
-    
-    blender_end_time = time.time()
-    blender_duration = blender_end_time - blender_start_time
-    
     # Prepare render tasks
     render_prep_start_time = time.time()
     
@@ -200,18 +214,64 @@ def prepare_experiment(blender_tasks, image_base_dir, show_coords=True, show_gri
     render_prep_duration = render_prep_end_time - render_prep_start_time
     
     total_render_tasks = len(render_tasks)
-    
-    # Execute render tasks
-    render_start_time = time.time()
-    
     coords_center = Vector((0, 0, 0))
-    render_results = render_scene_sequential(render_tasks, show_coords=show_coords, show_grid=show_grid, 
-                                             coords_center=coords_center, mode=mode, 
-                                             rotation_angle=rotation_angle,
-                                             vg_mode=vg_mode, **view_kwargs)
     
-    render_end_time = time.time()
-    render_duration = render_end_time - render_start_time
+    if pipeline:
+        render_kwargs = worker_render_kwargs(show_coords=show_coords, show_grid=show_grid,
+                                             coords_center=coords_center, mode=mode,
+                                             rotation_angle=rotation_angle, vg_mode=vg_mode, **view_kwargs)
+        render_task_by_id = {render_task[1]: render_task for render_task in render_tasks}
+        pending_renders = []
+        
+        with blender_process_pool(1) as render_pool:
+            def submit_render(task, result):
+                pending_renders.append(render_pool.apply_async(
+                    render_scene_worker, ((render_task_by_id[task[2]], render_kwargs),)))
+            
+            # Execute blender tasks, each finished scene is queued for rendering right away
+            blender_start_time = time.time()
+            results = execute_blender_tasks_direct_sequential(blender_tasks=blender_tasks, real_world=real_world,
+                                                              gltf_base_dir=gltf_base_dir,
+                                                              on_task_done=submit_render)
+            blender_end_time = time.time()
+            blender_duration = blender_end_time - blender_start_time
+            
+            # Wait for the renders still in flight; render_duration is only the part not hidden behind the build
+            render_start_time = time.time()
+            render_results = [pending.get() for pending in pending_renders]
+            render_end_time = time.time()
+            render_duration = render_end_time - render_start_time
+    else:
+        # Execute blender tasks
+        blender_start_time = time.time()
+        
+        if parallel:
+            results = execute_blender_tasks_direct_parallel(blender_tasks=blender_tasks, real_world=real_world,
+                                                            gltf_base_dir=gltf_base_dir, num_workers=num_workers)
+        else:
+            results = execute_blender_tasks_direct_sequential(blender_tasks=blender_tasks, real_world=real_world,
+                                                              gltf_base_dir=gltf_base_dir)
+        
+        blender_end_time = time.time()
+        blender_duration = blender_end_time - blender_start_time
+        
+        # Execute render tasks
+        render_start_time = time.time()
+        
+        if parallel:
+            render_results = render_scene_parallel(render_tasks, show_coords=show_coords, show_grid=show_grid,
+                                                   coords_center=coords_center, mode=mode,
+                                                   rotation_angle=rotation_angle,
+                                                   vg_mode=vg_mode, num_workers=num_workers, gpu_ids=gpu_ids,
+                                                   **view_kwargs)
+        else:
+            render_results = render_scene_sequential(render_tasks, show_coords=show_coords, show_grid=show_grid, 
+                                                     coords_center=coords_center, mode=mode, 
+                                                     rotation_angle=rotation_angle,
+                                                     vg_mode=vg_mode, **view_kwargs)
+        
+        render_end_time = time.time()
+        render_duration = render_end_time - render_start_time
     
     # Calculate total time
     experiment_end_time = time.time()
@@ -251,21 +311,19 @@ def save_qa_tuples_to_csv(qa_tuples, output_dir, csv_filename=None):
     csv_path = os.path.join(output_dir, csv_filename)
     
     try:
-        with open(csv_path, 'w', newline='', encoding='utf-8') as csvfile:
+        with open(csv_path, 'w', newline='', encoding='utf-8', buffering=1 << 20) as csvfile:
             writer = csv.writer(csvfile)
             
             # Write header
             writer.writerow(['Task_ID', 'Question', 'Answer'])
             
             # Write Q&A pairs with task IDs
-            for i, (question, answer) in enumerate(qa_tuples, 1):
-                task_id = f"task_{i}"
-                writer.writerow([task_id, question, answer])
+            writer.writerows([f"task_{i}", question, answer] for i, (question, answer) in enumerate(qa_tuples, 1))
         
-        logger.info(f"✓ Q&A pairs saved to: {csv_path}")
-        logger.info(f"  Total pairs: {len(qa_tuples)}")
+        logger.info("✓ Q&A pairs saved to: %s", csv_path)
+        logger.info("  Total pairs: %d", len(qa_tuples))
         return csv_path
         
     except Exception as e:
-        logger.info(f"Error saving CSV file: {str(e)}")
+        logger.info("Error saving CSV file: %s", e)
         return None
\ No newline at end of file
@@ -1,15 +1,17 @@
 from create_tasks import create_experiment, prepare_experiment
 import logging
 
-logging.basicConfig(
-    filename='experiment.log',
-    filemode='w',
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    level=logging.INFO
-)
-
 
 if __name__ == "__main__":
+    # configured here, not at import: spawned Blender workers re-import this module as __mp_main__
+    # and filemode='w' would truncate the log each time one starts
+    logging.basicConfig(
+        filename='experiment.log',
+        filemode='w',
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        level=logging.INFO
+    )
+
     gltf_base_dir = "your path for 3DComPat++ dataset"
 
     real_world = True
@@ -1,71 +1,200 @@
 import random
 import logging
+from functools import lru_cache
+from typing import NamedTuple, Tuple
 from color_materials import get_color_name_from_rgb
 
 logger = logging.getLogger("prompt_generation")
 
 
-def get_axis_sign(value, threshold=0.3):
-    """Get the sign of axis displacement with threshold for zero"""
-    if abs(value) < threshold:
-        return "0"
-    return "+" if value > 0 else "-"
+# Static prompt text, compiled once; each call only fills in the object names and the color block
+_MAIN_QUESTION_TEMPLATE = """Look at this 3D scene carefully from different viewpoints. You can see several geometric objects and coordinate axes.
+
+COORDINATE SYSTEM:
+- X-axis: RED rod, pointing to positive X direction
+- Y-axis: GREEN rod, pointing to positive Y direction
+- Z-axis: BLUE rod, pointing to position Z direction
+- Origin (0,0,0): YELLOW sphere, located at the center of the {central}{color_desc}
+
+TASK:
+Determine the relative position of the {target} compared to the {central} in terms of their geometric centers.
+
+INSTRUCTIONS:
+1. Look at where the {target} is positioned relative to the {central}
+2. For each axis, determine if the {target} is in the positive (+) or negative (-) direction using the coordinate system shown in the images.
+3. If objects appear at approximately the same level on an axis, use (0)
+
+ANSWER FORMAT:
+Respond with exactly this format: <answer>(±X, ±Y, ±Z)</answer>
+Examples: <answer>(+X, -Y, +Z)</answer> or <answer>(-X, 0Y, -Z)</answer> or <answer>(0X, +Y, 0Z)</answer>
 
+What is the relative position of the {target} to the {central}?""".format
 
+_VISIBILITY_QUESTION_TEMPLATE = """Look at this 3D scene carefully from different viewpoints. You can see several geometric objects and coordinate axes.
+
+COORDINATE SYSTEM:
+- X-axis: RED rod, pointing to positive X direction
+- Y-axis: GREEN rod, pointing to positive Y direction
+- Z-axis: BLUE rod, pointing to position Z direction
+- Origin (0,0,0): YELLOW sphere, located at the center of the {central}{color_desc}
+
+TASK:
+Determine the relative position of the {target} compared to the {central} in terms of their geometric centers.
+
+INSTRUCTIONS:
+1. Look at where the {target} is positioned relative to the {central}
+2. Determine which axes are clearly visible in the image. 
+3. For each visible axis, determine if the {target} is in the positive (+) or negative (-) direction using the coordinate system shown in the images.
+4. If objects appear at approximately the same level on an axis, use (0)
+
+ANSWER FORMAT:
+Respond with exactly this format: <answer>(±X, ±Y, ±Z)</answer>
+You only need to include directions for those visible axes.
+Examples: <answer>(+X, -Y, +Z)</answer> or <answer>(-X, 0Y, -Z)</answer> or <answer>(0X, +Y, 0Z)</answer>
+
+What is the relative position of the {target} to the {central}?""".format
+
+
+def _view_question_template(view_name, viewing_direction, visible_axes, axis_descriptions):
+    # Bake the per-view text in, leaving {central}, {target} and {color_desc} for .format
+    axis_desc = "\n- ".join([""] + axis_descriptions)
+    axes_and = ' and '.join(visible_axes)
+    axis1, axis2 = visible_axes
+    return f"""Look at this {view_name} carefully. You can see several geometric objects and coordinate axes.
+
+VIEW DESCRIPTION:
+This is the {view_name}, {viewing_direction}.
+
+COORDINATE SYSTEM:{axis_desc}
+- Origin (0,0,0): YELLOW sphere, located at the center of the {{central}}{{color_desc}}
+
+TASK:
+Determine the relative position of the {{target}} compared to the {{central}} in terms of their geometric centers, focusing only on the {axes_and} axes visible in this view.
+
+INSTRUCTIONS:
+1. Look at where the {{target}} is positioned relative to the {{central}}
+2. For each visible axis ({', '.join(visible_axes)}), determine if the {{target}} is in the positive (+) or negative (-) direction using the coordinate system shown in the image.
+3. If objects appear at approximately the same level on an axis, use (0)
+
+ANSWER FORMAT:
+Respond with exactly this format for the {axes_and} axes: <answer>(±{axis1}, ±{axis2})</answer>
+Examples: <answer>(+{axis1}, -{axis2})</answer> or <answer>(0{axis1}, +{axis2})</answer>
+
+What is the relative position of the {{target}} to the {{central}} in the {axes_and} axes?""".format
+
+
+class _ViewSpec(NamedTuple):
+    key: str
+    name: str
+    visible_axes: Tuple[str, str]
+    axis_idx: Tuple[int, int]  # positions of visible_axes in an (x, y, z) tuple
+    template: object  # bound str.format of the view's question text
+
+
+_AXIS_LABEL = ('X', 'Y', 'Z')
+
+# The three views of the multi-agent setting, built once at import
+_VIEWS = tuple(
+    _ViewSpec(view_key, view_name, visible_axes, tuple(_AXIS_LABEL.index(axis) for axis in visible_axes),
+              _view_question_template(view_name, viewing_direction, visible_axes, axis_descriptions))
+    for view_key, view_name, visible_axes, axis_descriptions, viewing_direction in (
+        ('front', 'Front View (XZ plane)', ('X', 'Z'),
+         ["X-axis: RED rod, pointing to positive X direction",
+          "Z-axis: BLUE rod, pointing to positive Z direction"],
+         'looking along the Y-axis'),
+        ('side', 'Side View (YZ plane)', ('Y', 'Z'),
+         ["Y-axis: GREEN rod, pointing to positive Y direction",
+          "Z-axis: BLUE rod, pointing to positive Z direction"],
+         'looking along the X-axis'),
+        ('top', 'Top View (XY plane)', ('X', 'Y'),
+         ["X-axis: RED rod, pointing to positive X direction",
+          "Y-axis: GREEN rod, pointing to positive Y direction"],
+         'looking along the Z-axis from above'),
+    )
+)
+
+
+_SIGN = ('-', '0', '+')
+
+
+def get_axis_sign(value, threshold=0.3):
+    """Get the sign of axis displacement with threshold for zero"""
+    return _SIGN[(value >= threshold) - (value <= -threshold) + 1]
+
+
+def _axis_signs(relative_vector, threshold=0.3):
+    # Signs of the (x, y, z) displacement, unrolled
+    x, y, z = relative_vector
+    return (_SIGN[(x >= threshold) - (x <= -threshold) + 1],
+            _SIGN[(y >= threshold) - (y <= -threshold) + 1],
+            _SIGN[(z >= threshold) - (z <= -threshold) + 1])
+
+
+def _full_expected_answer(signs):
+    sx, sy, sz = signs
+    return f"({sx}X, {sy}Y, {sz}Z)"
+
+
+def _vector_dict(relative_vector):
+    # ground_truth_vector keeps its {'x', 'y', 'z'} form for callers of the generated questions
+    x, y, z = relative_vector
+    return {'x': x, 'y': y, 'z': z}
+
+
+# Two-character category code (the object id prefix, e.g. "25" in "25_325") -> object name
+_PREFIX_MAP = {
+    '00': 'airplane',
+    '01': 'bag',
+    '02': 'basket',
+    '03': 'bbq_grill',
+    '04': 'bed',
+    '05': 'bench',
+    '06': 'bicycle',
+    '07': 'bird_house',
+    '08': 'boat',
+    '09': 'cabinet',
+    '0a': 'candle_holder',
+    '0b': 'car',
+    '0c': 'chair',
+    '0d': 'clock',
+    '0e': 'coat_rack',
+    '0f': 'curtain',
+    '10': 'dishwasher',
+    '11': 'dresser',
+    '12': 'fan',
+    '13': 'faucet',
+    '14': 'garbage_bin',
+    '15': 'gazebo',
+    '16': 'jug',
+    '17': 'ladder',
+    '18': 'lamp',
+    '19': 'love_seat',
+    '1a': 'ottoman',
+    '1b': 'parasol',
+    '1c': 'planter',
+    '1d': 'shelf',
+    '1e': 'shower',
+    '1f': 'sinks',
+    '20': 'skateboard',
+    '21': 'sofa',
+    '22': 'sports_table',
+    '23': 'stool',
+    '24': 'sun_lounger',
+    '25': 'table',
+    '26': 'toilet',
+    '27': 'tray',
+    '28': 'trolley',
+    '29': 'vase',
+}
+
+
+@lru_cache(maxsize=512)
 def get_object_name(object_id):
-    prefix_map = {
-        '00': 'airplane', 
-        '01': 'bag', 
-        '02': 'basket', 
-        '03': 'bbq_grill', 
-        '04': 'bed', 
-        '05': 'bench', 
-        '06': 'bicycle', 
-        '07': 'bird_house', 
-        '08': 'boat', 
-        '09': 'cabinet', 
-        '0a': 'candle_holder', 
-        '0b': 'car', 
-        '0c': 'chair', 
-        '0d': 'clock', 
-        '0e': 'coat_rack', 
-        '0f': 'curtain', 
-        '10': 'dishwasher', 
-        '11': 'dresser', 
-        '12': 'fan', 
-        '13': 'faucet', 
-        '14': 'garbage_bin', 
-        '15': 'gazebo', 
-        '16': 'jug', 
-        '17': 'ladder', 
-        '18': 'lamp', 
-        '19': 'love_seat', 
-        '1a': 'ottoman', 
-        '1b': 'parasol', 
-        '1c': 'planter', 
-        '1d': 'shelf', 
-        '1e': 'shower', 
-        '1f': 'sinks', 
-        '20': 'skateboard', 
-        '21': 'sofa', 
-        '22': 'sports_table', 
-        '23': 'stool', 
-        '24': 'sun_lounger', 
-        '25': 'table', 
-        '26': 'toilet', 
-        '27': 'tray', 
-        '28': 'trolley', 
-        '29': 'vase'}
-    if "_" in object_id:  # Ensure the file has an underscore
-        prefix = object_id.split("_")[0]
-    return prefix_map[prefix]
+    return _PREFIX_MAP[object_id[:2]]
 
 
 def replace_ids_by_names(obj_dict, id=None):
-    new_dict = {}
-    for obj_id, value in obj_dict.items():
-        obj_name = get_object_name(obj_id)
-        new_dict[obj_name] = value
+    new_dict = {get_object_name(obj_id): value for obj_id, value in obj_dict.items()}
     if id:
         obj_name = get_object_name(id)
         return new_dict, obj_name
@@ -82,46 +211,47 @@ def get_objects_metadata_for_prompt(experiment_config, real_world=False):
     if real_world:
         all_objects, central_object_name = replace_ids_by_names(all_objects, central_obj['type'])
     
-    # Get all objects except the central object
-    other_objects = {name: pos for name, pos in all_objects.items() 
-                    if name != central_object_name}
-    
-    # Randomly sample one object from the remaining objects
-    sampled_obj_name = random.choice(list(other_objects.keys()))
-    sampled_obj_pos = other_objects[sampled_obj_name]
+    # Randomly sample one object from all objects except the central one, without copying them;
+    # randrange draws exactly what random.choice over the remaining objects would
+    num_others = len(all_objects) - (central_object_name in all_objects)
+    skip = random.randrange(num_others)
+    for sampled_obj_name, sampled_obj_pos in all_objects.items():
+        if sampled_obj_name == central_object_name:
+            continue
+        if skip == 0:
+            break
+        skip -= 1
     
     # Calculate relative vector (sampled_object_position - central_position)
-    relative_vector = {
-        'x': sampled_obj_pos[0] - central_pos[0],
-        'y': sampled_obj_pos[1] - central_pos[1],
-        'z': sampled_obj_pos[2] - central_pos[2]
-    }
+    relative_vector = (sampled_obj_pos[0] - central_pos[0],
+                       sampled_obj_pos[1] - central_pos[1],
+                       sampled_obj_pos[2] - central_pos[2])
     
     target_object_name = sampled_obj_name
 
     return central_object_name, target_object_name, relative_vector
 
 
-def generate_color_description(color_map, real_world=False):
-    # Create color description if color mapping is enabled
-    color_description = ""
-    if real_world:
-        color_map, _ = replace_ids_by_names(color_map, id=None)
-    if color_map:
-        # Create a string describing each object's color
-        color_descriptions = []
-        for obj_type, color_rgb in color_map.items():
-            color_name = get_color_name_from_rgb(color_rgb)
-            color_descriptions.append(f"- {obj_type}: {color_name}")
-        
-        color_list = "\n".join(color_descriptions)
-        color_description = f"""
+@lru_cache(maxsize=1024)
+def _format_color_description(color_items):
+    # color_items: ((obj_type, rgb_tuple), ...) in color map order
+    color_list = "\n".join(f"- {obj_type}: {get_color_name_from_rgb(color_rgb)}"
+                           for obj_type, color_rgb in color_items)
+    return f"""
 OBJECT COLORS:
 {color_list}
 - Use these colors along with shapes to identify the objects mentioned in the task
 """
-    
-    return color_description
+
+
+def generate_color_description(color_map, real_world=False):
+    # Create color description if color mapping is enabled
+    if not color_map:
+        return ""
+    if real_world:
+        color_map, _ = replace_ids_by_names(color_map, id=None)
+    # Same objects with the same colors (in the same order) reuse the formatted block
+    return _format_color_description(tuple((obj_type, tuple(color_rgb)) for obj_type, color_rgb in color_map.items()))
 
 
 def generate_vlm_test_question(experiment_config, color=False, real_world=False):
@@ -137,75 +267,23 @@ def generate_vlm_test_question(experiment_config, color=False, real_world=False)
         color_description = ""
 
     # Generate question with clear, structured prompt
-    question = f"""Look at this 3D scene carefully from different viewpoints. You can see several geometric objects and coordinate axes.
-
-COORDINATE SYSTEM:
-- X-axis: RED rod, pointing to positive X direction
-- Y-axis: GREEN rod, pointing to positive Y direction
-- Z-axis: BLUE rod, pointing to position Z direction
-- Origin (0,0,0): YELLOW sphere, located at the center of the {central_object_name}{color_description}
-
-TASK:
-Determine the relative position of the {target_object_name} compared to the {central_object_name} in terms of their geometric centers.
-
-INSTRUCTIONS:
-1. Look at where the {target_object_name} is positioned relative to the {central_object_name}
-2. For each axis, determine if the {target_object_name} is in the positive (+) or negative (-) direction using the coordinate system shown in the images.
-3. If objects appear at approximately the same level on an axis, use (0)
-
-ANSWER FORMAT:
-Respond with exactly this format: <answer>(±X, ±Y, ±Z)</answer>
-Examples: <answer>(+X, -Y, +Z)</answer> or <answer>(-X, 0Y, -Z)</answer> or <answer>(0X, +Y, 0Z)</answer>
-
-What is the relative position of the {target_object_name} to the {central_object_name}?"""
+    question = _MAIN_QUESTION_TEMPLATE(central=central_object_name, target=target_object_name,
+                                       color_desc=color_description)
     
-    expected_answer = f"({get_axis_sign(relative_vector['x'])}X, " \
-                     f"{get_axis_sign(relative_vector['y'])}Y, " \
-                     f"{get_axis_sign(relative_vector['z'])}Z)"
+    expected_answer = _full_expected_answer(_axis_signs(relative_vector))
     
     return {
         "question": question,
         "expected_answer": expected_answer,
         "target_object_clean": target_object_name,
         "central_object_clean": central_object_name,
-        "ground_truth_vector": relative_vector
+        "ground_truth_vector": _vector_dict(relative_vector)
     }
 
 
 def generate_vlm_test_questions_multiagent(experiment_config, color=False, real_world=False):
     central_object_name, target_object_name, relative_vector = get_objects_metadata_for_prompt(experiment_config, real_world)
     
-    # Define the three views and their visible axes
-    views = {
-        'front': {
-            'name': 'Front View (XZ plane)',
-            'visible_axes': ['X', 'Z'],
-            'axis_descriptions': [
-                "X-axis: RED rod, pointing to positive X direction",
-                "Z-axis: BLUE rod, pointing to positive Z direction"
-            ],
-            'viewing_direction': 'looking along the Y-axis'
-        },
-        'side': {
-            'name': 'Side View (YZ plane)', 
-            'visible_axes': ['Y', 'Z'],
-            'axis_descriptions': [
-                "Y-axis: GREEN rod, pointing to positive Y direction",
-                "Z-axis: BLUE rod, pointing to positive Z direction"
-            ],
-            'viewing_direction': 'looking along the X-axis'
-        },
-        'top': {
-            'name': 'Top View (XY plane)',
-            'visible_axes': ['X', 'Y'],
-            'axis_descriptions': [
-                "X-axis: RED rod, pointing to positive X direction",
-                "Y-axis: GREEN rod, pointing to positive Y direction"
-            ],
-            'viewing_direction': 'looking along the Z-axis from above'
-        }
-    }
-
     if color:
         color_map = experiment_config.get('color_map', {})
         color_description = generate_color_description(color_map)
@@ -214,66 +292,36 @@ def generate_vlm_test_questions_multiagent(experiment_config, color=False, real_
     
     # Generate questions for each view
     questions = {}
+    signs = _axis_signs(relative_vector)
     
-    for view_key, view_info in views.items():
-        # Create axis descriptions string
-        axis_desc = "\n- ".join([""] + view_info['axis_descriptions'])
-        
+    for view in _VIEWS:
         # Create the question for this view
-        question = f"""Look at this {view_info['name']} carefully. You can see several geometric objects and coordinate axes.
-
-VIEW DESCRIPTION:
-This is the {view_info['name']}, {view_info['viewing_direction']}.
-
-COORDINATE SYSTEM:{axis_desc}
-- Origin (0,0,0): YELLOW sphere, located at the center of the {central_object_name}{color_description}
-
-TASK:
-Determine the relative position of the {target_object_name} compared to the {central_object_name} in terms of their geometric centers, focusing only on the {' and '.join(view_info['visible_axes'])} axes visible in this view.
-
-INSTRUCTIONS:
-1. Look at where the {target_object_name} is positioned relative to the {central_object_name}
-2. For each visible axis ({', '.join(view_info['visible_axes'])}), determine if the {target_object_name} is in the positive (+) or negative (-) direction using the coordinate system shown in the image.
-3. If objects appear at approximately the same level on an axis, use (0)
-
-ANSWER FORMAT:
-Respond with exactly this format for the {' and '.join(view_info['visible_axes'])} axes: <answer>(±{view_info['visible_axes'][0]}, ±{view_info['visible_axes'][1]})</answer>
-Examples: <answer>(+{view_info['visible_axes'][0]}, -{view_info['visible_axes'][1]})</answer> or <answer>(0{view_info['visible_axes'][0]}, +{view_info['visible_axes'][1]})</answer>
-
-What is the relative position of the {target_object_name} to the {central_object_name} in the {' and '.join(view_info['visible_axes'])} axes?"""
+        question = view.template(central=central_object_name, target=target_object_name,
+                                 color_desc=color_description)
 
         # Generate expected answer for this view's visible axes
-        axis_values = {
-            'X': relative_vector['x'],
-            'Y': relative_vector['y'], 
-            'Z': relative_vector['z']
-        }
+        i1, i2 = view.axis_idx
+        expected_answer = f"({signs[i1]}{_AXIS_LABEL[i1]}, {signs[i2]}{_AXIS_LABEL[i2]})"
         
-        axis1, axis2 = view_info['visible_axes']
-        expected_answer = f"({get_axis_sign(axis_values[axis1])}{axis1}, " \
-                         f"{get_axis_sign(axis_values[axis2])}{axis2})"
-        
-        questions[view_key] = {
+        questions[view.key] = {
             "question": question,
             "expected_answer": expected_answer,
-            "visible_axes": view_info['visible_axes'],
-            "view_name": view_info['name']
+            "visible_axes": list(view.visible_axes),
+            "view_name": view.name
         }
     
     # Common metadata for all views
     common_metadata = {
         "target_object_clean": target_object_name,
         "central_object_clean": central_object_name,
-        "ground_truth_vector": relative_vector,
+        "ground_truth_vector": _vector_dict(relative_vector),
         "color_enabled": color
     }
     
     return {
         "questions": questions,
         "metadata": common_metadata,
-        "full_expected_answer": f"({get_axis_sign(relative_vector['x'])}X, " \
-                               f"{get_axis_sign(relative_vector['y'])}Y, " \
-                               f"{get_axis_sign(relative_vector['z'])}Z)"
+        "full_expected_answer": _full_expected_answer(signs)
     }
 
 
@@ -290,38 +338,15 @@ def generate_vlm_test_question_visibility(experiment_config, color=False, real_w
         color_description = ""
 
     # Generate question with clear, structured prompt
-    question = f"""Look at this 3D scene carefully from different viewpoints. You can see several geometric objects and coordinate axes.
-
-COORDINATE SYSTEM:
-- X-axis: RED rod, pointing to positive X direction
-- Y-axis: GREEN rod, pointing to positive Y direction
-- Z-axis: BLUE rod, pointing to position Z direction
-- Origin (0,0,0): YELLOW sphere, located at the center of the {central_object_name}{color_description}
-
-TASK:
-Determine the relative position of the {target_object_name} compared to the {central_object_name} in terms of their geometric centers.
-
-INSTRUCTIONS:
-1. Look at where the {target_object_name} is positioned relative to the {central_object_name}
-2. Determine which axes are clearly visible in the image. 
-3. For each visible axis, determine if the {target_object_name} is in the positive (+) or negative (-) direction using the coordinate system shown in the images.
-4. If objects appear at approximately the same level on an axis, use (0)
-
-ANSWER FORMAT:
-Respond with exactly this format: <answer>(±X, ±Y, ±Z)</answer>
-You only need to include directions for those visible axes.
-Examples: <answer>(+X, -Y, +Z)</answer> or <answer>(-X, 0Y, -Z)</answer> or <answer>(0X, +Y, 0Z)</answer>
-
-What is the relative position of the {target_object_name} to the {central_object_name}?"""
+    question = _VISIBILITY_QUESTION_TEMPLATE(central=central_object_name, target=target_object_name,
+                                             color_desc=color_description)
     
-    expected_answer = f"({get_axis_sign(relative_vector['x'])}X, " \
-                     f"{get_axis_sign(relative_vector['y'])}Y, " \
-                     f"{get_axis_sign(relative_vector['z'])}Z)"
+    expected_answer = _full_expected_answer(_axis_signs(relative_vector))
     
     return {
         "question": question,
         "expected_answer": expected_answer,
         "target_object_clean": target_object_name,
         "central_object_clean": central_object_name,
-        "ground_truth_vector": relative_vector
+        "ground_truth_vector": _vector_dict(relative_vector)
     }
\ No newline at end of file
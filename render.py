@@ -1,11 +1,16 @@
 import bpy
 from mathutils import Vector
 import math
+import numpy as np
 import logging
 import os
+import json
 import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from visual_enhance import create_scene_2D, create_scene_3D, create_grid_for_view
 from view_generator import ViewGenerator
+from bpy_execution import blender_process_pool
 
 logger = logging.getLogger("render")
 
@@ -16,16 +21,26 @@ def calculate_scene_center():
     if not mesh_objects:
         raise ValueError("No mesh objects found in the scene.")
     
-    # Compute the centroid
-    total_location = sum((obj.location for obj in mesh_objects), start=Vector((0, 0, 0)))
-    center = total_location / len(mesh_objects)
-    return center
+    # Compute the centroid as one reduction over an (N, 3) array of locations
+    locations = np.fromiter((c for obj in mesh_objects for c in obj.location), dtype=np.float64,
+                            count=3 * len(mesh_objects)).reshape(-1, 3)
+    return Vector(locations.mean(axis=0).tolist())
+
+
+def new_light(light_type, name, location=(0, 0, 0), energy=None):
+    """Create and link a light object through bpy.data, avoiding the scene update bpy.ops.object.light_add forces."""
+    light_data = bpy.data.lights.new(name=name, type=light_type)
+    if energy is not None:
+        light_data.energy = energy
+    light = bpy.data.objects.new(name=name, object_data=light_data)
+    light.location = location
+    bpy.context.collection.objects.link(light)
+    return light
 
 
 def add_light_to_scene(scene_center, light_distance=3, light_strength=2000):
     # Add a light to the scene
-    bpy.ops.object.light_add(type='POINT', location=(0, 0, 0))
-    key_light = bpy.context.object
+    key_light = new_light('POINT', "Point")
     key_light.location = (
         scene_center.x + light_distance / math.sqrt(2),  # 45-degree x offset
         scene_center.y - light_distance / math.sqrt(2),  # 45-degree y offset
@@ -35,8 +50,7 @@ def add_light_to_scene(scene_center, light_distance=3, light_strength=2000):
 
     key_light.rotation_euler = (math.radians(45), 0, math.radians(45))  # Point at the object
 
-    bpy.ops.object.light_add(type='POINT', location=(0, 0, 0))
-    fill_light = bpy.context.object
+    fill_light = new_light('POINT', "Point")
     fill_light.location = (
         scene_center.x - 1.5 * light_distance / math.sqrt(2),
         scene_center.y - 1.5 * light_distance / math.sqrt(2),
@@ -44,8 +58,7 @@ def add_light_to_scene(scene_center, light_distance=3, light_strength=2000):
     )
     fill_light.data.energy = light_strength / 2
 
-    bpy.ops.object.light_add(type='POINT', location=(0, 0, 0))
-    back_light = bpy.context.object
+    back_light = new_light('POINT', "Point")
     back_light.location = (
         scene_center.x,
         scene_center.y + 2 * light_distance,
@@ -55,10 +68,14 @@ def add_light_to_scene(scene_center, light_distance=3, light_strength=2000):
 
 
 def add_sun_camera_light(camera, strength=5.0):
+    # reuse the camera's sun if a previous render already added one
+    sun = next((c for c in camera.children if c.type == 'LIGHT' and c.data.type == 'SUN'), None)
+    if sun is not None:
+        sun.data.energy = strength
+        return
+
     # add a sun lamp at camera
-    bpy.ops.object.light_add(type='SUN', location=camera.location)
-    sun = bpy.context.object
-    sun.data.energy = strength
+    sun = new_light('SUN', "Sun", location=camera.location, energy=strength)
 
     # point it in exactly the same direction as the camera
     sun.rotation_euler = camera.rotation_euler
@@ -83,12 +100,9 @@ def add_light_to_scene_camera_follow(camera, light_distance=3, light_strength=20
 
     for name, off in offsets.items():
         # create the lamp
-        bpy.ops.object.light_add(type='POINT', location=camera.location)
-        lamp = bpy.context.object
-        lamp.name = f"{name}_light"
-        lamp.data.energy = light_strength * {
+        lamp = new_light('POINT', f"{name}_light", location=camera.location, energy=light_strength * {
             'key': 1.0, 'fill': 0.5, 'back': 0.75
-        }[name]
+        }[name])
 
         # move it to camera-local offset
         world_pos = camera.matrix_world @ off
@@ -98,26 +112,79 @@ def add_light_to_scene_camera_follow(camera, light_distance=3, light_strength=20
         lamp.parent = camera
 
 
-def set_render_config(resolution_w=720, resolution_h=720, num_sample=32):
+# Cycles GPU backends in order of preference
+_GPU_DEVICE_TYPES = ('OPTIX', 'CUDA', 'HIP', 'ONEAPI', 'METAL')
+_cycles_device = None
+
+
+def get_cycles_device():
+    """Enable the GPUs of the first backend that has any and return 'GPU', or 'CPU' if there are none.
+    Probing devices is slow, so it's done once per process."""
+    global _cycles_device
+    if _cycles_device is not None:
+        return _cycles_device
+
+    _cycles_device = 'CPU'
+    prefs = bpy.context.preferences.addons['cycles'].preferences
+    for device_type in _GPU_DEVICE_TYPES:
+        try:
+            prefs.compute_device_type = device_type
+        except TypeError:  # backend not available in this Blender build
+            continue
+        prefs.get_devices()
+        if any(device.type == device_type for device in prefs.devices):
+            for device in prefs.devices:
+                device.use = device.type == device_type
+            _cycles_device = 'GPU'
+            break
+    else:
+        prefs.compute_device_type = 'NONE'
+
+    logger.info(f"Cycles renders on {_cycles_device} ({prefs.compute_device_type})")
+    return _cycles_device
+
+
+def _eevee_engine_id():
+    # EEVEE is registered as BLENDER_EEVEE_NEXT from Blender 4.2 on
+    engines = bpy.types.RenderSettings.bl_rna.properties['engine'].enum_items.keys()
+    return 'BLENDER_EEVEE_NEXT' if 'BLENDER_EEVEE_NEXT' in engines else 'BLENDER_EEVEE'
+
+
+def set_render_config(resolution_w=720, resolution_h=720, num_sample=32, use_gpu=True,
+                      engine='CYCLES', eevee_samples=16):
+    """
+    engine: 'CYCLES' (path traced, default), 'EEVEE' (rasterized, much cheaper for these
+            primitive/axis/grid scenes) or any other render engine id, e.g. 'BLENDER_WORKBENCH'
+    """
     bpy.context.scene.render.resolution_x = resolution_w  # e.g., width
     bpy.context.scene.render.resolution_y = resolution_h   # e.g., height
     bpy.context.scene.render.resolution_percentage = 100
     
-    bpy.context.scene.render.engine = 'CYCLES'
-    bpy.context.scene.cycles.samples = num_sample
+    if engine in ('EEVEE', 'BLENDER_EEVEE', 'BLENDER_EEVEE_NEXT'):
+        engine = _eevee_engine_id()
+    bpy.context.scene.render.engine = engine
+    if engine == 'CYCLES':
+        bpy.context.scene.cycles.samples = num_sample
+        bpy.context.scene.cycles.device = get_cycles_device() if use_gpu else 'CPU'
+    elif engine.startswith('BLENDER_EEVEE'):
+        bpy.context.scene.eevee.taa_render_samples = eevee_samples
+    # Only the camera moves between views, keep the synced scene and BVH from one render to the next
+    bpy.context.scene.render.use_persistent_data = True
+
+
+# Rotation component each orthographic view is turned around (other views aren't rotated)
+_ROTATION_AXIS = {'front': 1, 'side': 1, 'top': 2}
 
 
 def apply_camera_rotation(views, rotation_angle):
+    angle = math.radians(rotation_angle)
     for view in views:
         # Convert tuple to list, modify, convert back to tuple
         rotation_list = list(view["rotation"])
         
-        if view['name'] == 'front':
-            rotation_list[1] += math.radians(rotation_angle)
-        elif view['name'] == 'side':
-            rotation_list[1] += math.radians(rotation_angle)
-        elif view['name'] == 'top':
-            rotation_list[2] += math.radians(rotation_angle)
+        axis = _ROTATION_AXIS.get(view['name'])
+        if axis is not None:
+            rotation_list[axis] += angle
         
         view["rotation"] = tuple(rotation_list)
     
@@ -149,6 +216,60 @@ def clear_grid_objects():
         bpy.data.objects.remove(obj, do_unlink=True)
 
 
+# Coordinate rigs and grids in the scene: key -> their objects, reused across views and renders.
+# Keys start with the overlay kind ("3D", "2D", "grid"); one overlay per kind is kept resident,
+# so hidden rigs and grids don't pile up in the scene that every render has to sync.
+_OVERLAYS = {}
+
+
+def _overlay_alive(objs):
+    try:
+        for obj in objs:
+            obj.name  # raises ReferenceError once the object has been removed (e.g. by empty_scene)
+        return True
+    except ReferenceError:
+        return False
+
+
+def get_overlay(key, build):
+    """Objects of the overlay identified by key, calling build() to create them if they don't exist (anymore)."""
+    objs = _OVERLAYS.get(key)
+    if objs is not None and _overlay_alive(objs):
+        return objs
+    # Replace the overlay of the same kind built for a different center/view/size
+    for old_key in [old_key for old_key in _OVERLAYS if old_key[0] == key[0]]:
+        old_objs = _OVERLAYS.pop(old_key)
+        if _overlay_alive(old_objs):
+            bpy.data.batch_remove(ids=old_objs)
+    before = set(bpy.data.objects)
+    build()
+    objs = [obj for obj in bpy.data.objects if obj not in before]
+    _OVERLAYS[key] = objs
+    return objs
+
+
+def show_only_overlays(active_overlays):
+    """Render the given overlays and hide every other cached one."""
+    shown = {obj for objs in active_overlays for obj in objs}
+    for objs in _OVERLAYS.values():
+        for obj in objs:
+            obj.hide_render = obj not in shown
+
+
+def prune_overlays():
+    """Forget overlays whose objects are gone and remove overlay objects no cached overlay owns."""
+    for key in [key for key, objs in _OVERLAYS.items() if not _overlay_alive(objs)]:
+        del _OVERLAYS[key]
+    # only objects visual_enhance linked into the overlay collection count, never scene objects that share a name
+    widgets = bpy.data.collections.get("VizWidgets")
+    if widgets is None:
+        return
+    owned = {obj for objs in _OVERLAYS.values() for obj in objs}
+    stray = [obj for obj in widgets.objects if obj not in owned]
+    if stray:
+        bpy.data.batch_remove(ids=stray)
+
+
 def focus_camera_and_render(output_dir, object_id, camera_distance=5,
                             mode='3D',
                             show_coordinates=True,
@@ -157,9 +278,12 @@ def focus_camera_and_render(output_dir, object_id, camera_distance=5,
                             coords_center=None, 
                             rotation_angle=45,
                             vg_mode="circle",
+                            scene_center=None,
+                            render_engine='CYCLES',
                             **view_kwargs):
-    # Calculate the center of the scene
-    scene_center = calculate_scene_center()
+    # Calculate the center of the scene (callers rendering a static scene repeatedly can pass it in)
+    if scene_center is None:
+        scene_center = calculate_scene_center()
     
     # Set coordinate system center (defaults to scene center)
     if coords_center is None:
@@ -178,7 +302,7 @@ def focus_camera_and_render(output_dir, object_id, camera_distance=5,
     add_sun_camera_light(camera, strength=3.0)
 
     # Set render settings
-    set_render_config()
+    set_render_config(engine=render_engine)
 
     # Generate views with ALL required parameters
     try:
@@ -195,13 +319,21 @@ def focus_camera_and_render(output_dir, object_id, camera_distance=5,
     except Exception as e:
         logger.error(f"Error: {str(e)}")
 
-    for i in range(len(views)):
+    mode_key = mode.upper()
+    if show_coordinates and mode_key not in ("3D", "2D"):
+        raise ValueError(f"Invalid mode: {mode}. Must be '3D' or '2D'")
+    center_key = tuple(coords_center)
+
+    # Drop coordinate/grid objects that aren't part of a reusable overlay (e.g. left by older code)
+    prune_overlays()
+
+    # Loop invariants: output file prefix and the scene's render settings
+    output_prefix = os.path.join(output_dir, f"{object_id}_")
+    render_settings = bpy.context.scene.render
+
+    for i, view in enumerate(views, 1):
         
-        # Clear any existing coordinate objects from previous views
-        clear_coordinate_objects()
-        clear_grid_objects()
-        view = views[i]
-        logger.info(f"Rendering view {i+1}/{len(views)}: {view['name']}")
+        logger.info(f"Rendering view {i}/{len(views)}: {view['name']}")
         
         # Set camera position and rotation FIRST
         camera.location = view['position']
@@ -209,28 +341,33 @@ def focus_camera_and_render(output_dir, object_id, camera_distance=5,
 
         visible_axes = view['visible_axes']
 
+        # Coordinate rig and grid for this view; unchanged ones (3D axes, the 3D grid, repeated views)
+        # are reused and only shown/hidden instead of being deleted and re-created for every view
+        active_overlays = []
         if show_coordinates:
-            if mode.upper() == "3D":
-                create_scene_3D(scene_center=coords_center)
-            elif mode.upper() == '2D':
-                create_scene_2D(scene_center=coords_center, visible_axes=visible_axes,
-                                camera_position=view['position'], rotation_angle=rotation_angle)
+            if mode_key == "3D":
+                # The 3D coordinate system doesn't depend on the view
+                active_overlays.append(get_overlay(
+                    ("3D", center_key),
+                    lambda: create_scene_3D(scene_center=coords_center)))
             else:
-                raise ValueError(f"Invalid mode: {mode}. Must be '3D' or '2D'")
+                active_overlays.append(get_overlay(
+                    ("2D", center_key, tuple(visible_axes), tuple(view['position']), rotation_angle),
+                    lambda: create_scene_2D(scene_center=coords_center, visible_axes=visible_axes,
+                                            camera_position=view['position'], rotation_angle=rotation_angle)))
         
         if show_grid:
-            create_grid_for_view(
-                coords_center, 
-                view['name'], 
-                camera_distance=camera_distance,
-                opacity=opacity
-            )
+            # Grids only differ by plane: front/side/top, anything else gets the XY grid
+            grid_plane = view['name'] if view['name'] in ('front', 'side', 'top') else None
+            active_overlays.append(get_overlay(
+                ("grid", grid_plane, center_key, camera_distance, opacity),
+                lambda: create_grid_for_view(coords_center, view['name'],
+                                             camera_distance=camera_distance, opacity=opacity)))
+        
+        show_only_overlays(active_overlays)
         
         # Set render output path
-        bpy.context.scene.render.filepath = os.path.join(
-            output_dir,
-            f"{object_id}_{view['name']}.png"
-        )
+        render_settings.filepath = output_prefix + view['name'] + ".png"
         
         # Render the image
         bpy.ops.render.render(write_still=True)
@@ -238,8 +375,8 @@ def focus_camera_and_render(output_dir, object_id, camera_distance=5,
 
 def import_gltf(gltf_file_path):
     try:
-        bpy.ops.object.select_all(action='SELECT')
-        bpy.ops.object.delete()
+        # Drop whatever is in the scene directly instead of select-all + delete operators
+        bpy.data.batch_remove(ids=list(bpy.context.scene.objects))
         bpy.ops.import_scene.gltf(filepath=gltf_file_path)
     except Exception:
         raise ValueError(f"File '{gltf_file_path}' not found.")
@@ -263,6 +400,23 @@ def render_scene(args, show_coords=True, show_grid=True, coords_center=None, mod
         raise ValueError(f"Error rendering for {object_id}: {e}")
 
 
+def prefetch_gltf(gltf_file_path, chunk_size=1 << 20):
+    """Read a .gltf and the buffers/images it references so the importer finds them in the page cache.
+    Plain file I/O, no bpy, so it can run on a thread while the main thread renders."""
+    try:
+        with open(gltf_file_path, 'rb') as f:
+            gltf = json.load(f)
+        base_dir = os.path.dirname(gltf_file_path)
+        for entry in gltf.get('buffers', []) + gltf.get('images', []):
+            uri = entry.get('uri')
+            if uri and not uri.startswith('data:'):
+                with open(os.path.join(base_dir, uri), 'rb') as f:
+                    while f.read(chunk_size):
+                        pass
+    except (OSError, ValueError):
+        pass  # the importer reports missing or broken files itself
+
+
 def render_scene_sequential(render_image_tasks, show_coords=True, show_grid=True, coords_center=None, mode='3D', rotation_angle=45,
                             vg_mode="circle", **view_kwargs):
     start_time = time.time()
@@ -270,22 +424,73 @@ def render_scene_sequential(render_image_tasks, show_coords=True, show_grid=True
     logger.info(f"Processing {len(render_image_tasks)} rendering tasks sequentially...")
 
     results = []
-    for i, task in enumerate(render_image_tasks):
-        logger.info(f"Processing task {i+1}/{len(render_image_tasks)}")
-        try:
-            render_scene(task, show_coords=show_coords, show_grid=show_grid, coords_center=coords_center, mode=mode, rotation_angle=rotation_angle,
-                         vg_mode=vg_mode, **view_kwargs)
-            results.append("success")
-        except Exception as e:
-            logger.error(f"Task {i+1} failed: {str(e)}")
-            results.append("error")
+    # Warm the next scene's files on a background thread while the current one renders
+    with ThreadPoolExecutor(max_workers=1) as prefetcher:
+        for i, task in enumerate(render_image_tasks):
+            logger.info(f"Processing task {i+1}/{len(render_image_tasks)}")
+            if i + 1 < len(render_image_tasks):
+                prefetcher.submit(prefetch_gltf, render_image_tasks[i + 1][2])
+            try:
+                render_scene(task, show_coords=show_coords, show_grid=show_grid, coords_center=coords_center, mode=mode, rotation_angle=rotation_angle,
+                             vg_mode=vg_mode, **view_kwargs)
+                results.append("success")
+            except Exception as e:
+                logger.error(f"Task {i+1} failed: {str(e)}")
+                results.append("error")
     
     # Count successes and failures
-    successes = sum(1 for r in results if r == "success")
-    failures = sum(1 for r in results if r == "error")
+    counts = Counter(results)
+    successes, failures = counts["success"], counts["error"]
     
     logger.info(f"Completed {len(results)} rendering tasks: {successes} successful, {failures} failed")
     end_time = time.time()
     logger.info(f"Total rendering time: {end_time - start_time:.2f} seconds")
     
-    return results
\ No newline at end of file
+    return results
+
+
+def worker_render_kwargs(coords_center=None, **render_kwargs):
+    # mathutils types don't pickle, the center travels as a plain tuple
+    return dict(render_kwargs, coords_center=tuple(coords_center) if coords_center is not None else None)
+
+
+def render_scene_worker(args):
+    task, render_kwargs = args
+    if render_kwargs.get('coords_center') is not None:
+        render_kwargs = dict(render_kwargs, coords_center=Vector(render_kwargs['coords_center']))
+    try:
+        render_scene(task, **render_kwargs)
+        return "success"
+    except Exception as e:
+        logger.error(f"Task {task[1]} failed: {str(e)}")
+        return "error"
+
+
+def render_scene_parallel(render_image_tasks, show_coords=True, show_grid=True, coords_center=None, mode='3D', rotation_angle=45,
+                          vg_mode="circle", num_workers=None, gpu_ids=None, **view_kwargs):
+    """
+    Same as render_scene_sequential, but renders independent tasks in a pool of worker processes.
+    gpu_ids (e.g. [0, 1]) pins each worker to one of those GPUs, so 2 workers per GPU is gpu_ids=[0, 1], num_workers=4.
+    """
+    start_time = time.time()
+
+    if num_workers is None:
+        num_workers = os.cpu_count() or 1
+    num_workers = max(1, min(num_workers, len(render_image_tasks)))
+
+    logger.info(f"Processing {len(render_image_tasks)} rendering tasks on {num_workers} worker processes...")
+
+    render_kwargs = worker_render_kwargs(show_coords=show_coords, show_grid=show_grid, coords_center=coords_center,
+                                         mode=mode, rotation_angle=rotation_angle, vg_mode=vg_mode, **view_kwargs)
+    with blender_process_pool(num_workers, gpu_ids=gpu_ids) as pool:
+        # map keeps the input order, so results line up with render_image_tasks
+        results = pool.map(render_scene_worker, [(task, render_kwargs) for task in render_image_tasks], chunksize=1)
+
+    counts = Counter(results)
+    successes, failures = counts["success"], counts["error"]
+
+    logger.info(f"Completed {len(results)} rendering tasks: {successes} successful, {failures} failed")
+    end_time = time.time()
+    logger.info(f"Total rendering time: {end_time - start_time:.2f} seconds")
+
+    return results
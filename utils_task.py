@@ -2,6 +2,8 @@ import math
 import random
 import os
 import logging
+from functools import lru_cache
+import numpy as np
 
 logger = logging.getLogger("utils_task")
 
@@ -19,6 +21,58 @@ def generate_random_axes(degree_of_freedom):
     return selected_axes
 
 
+def _sample_sphere(center, radius):
+    # Full 3D sphere surface
+    azimuth = random.uniform(0, 2 * math.pi)
+    elevation = math.acos(random.uniform(-1, 1))
+    return (center[0] + radius * math.sin(elevation) * math.cos(azimuth),
+            center[1] + radius * math.sin(elevation) * math.sin(azimuth),
+            center[2] + radius * math.cos(elevation))
+
+
+def _sample_circle_xy(center, radius):
+    # XY plane (Z = center[2])
+    angle = random.uniform(0, 2 * math.pi)
+    return (center[0] + radius * math.cos(angle), center[1] + radius * math.sin(angle), center[2])
+
+
+def _sample_circle_xz(center, radius):
+    # XZ plane (Y = center[1])
+    angle = random.uniform(0, 2 * math.pi)
+    return (center[0] + radius * math.cos(angle), center[1], center[2] + radius * math.sin(angle))
+
+
+def _sample_circle_yz(center, radius):
+    # YZ plane (X = center[0])
+    angle = random.uniform(0, 2 * math.pi)
+    return (center[0], center[1] + radius * math.cos(angle), center[2] + radius * math.sin(angle))
+
+
+# 1D line along a single axis: random point on a segment of length 2*radius
+def _sample_line_x(center, radius):
+    return (center[0] + random.uniform(-radius, radius), center[1], center[2])
+
+
+def _sample_line_y(center, radius):
+    return (center[0], center[1] + random.uniform(-radius, radius), center[2])
+
+
+def _sample_line_z(center, radius):
+    return (center[0], center[1], center[2] + random.uniform(-radius, radius))
+
+
+# Candidate sampler for each set of free axes
+_AXIS_SAMPLERS = {
+    frozenset("XYZ"): _sample_sphere,
+    frozenset("XY"): _sample_circle_xy,
+    frozenset("XZ"): _sample_circle_xz,
+    frozenset("YZ"): _sample_circle_yz,
+    frozenset("X"): _sample_line_x,
+    frozenset("Y"): _sample_line_y,
+    frozenset("Z"): _sample_line_z,
+}
+
+
 def generate_random_positions(objects, axes, center=(0, 0, 0), radius=2.0, 
                               min_separation=1.4, max_attempts=1000, threshold=0.3):
     positioned_objects = {}
@@ -26,65 +80,22 @@ def generate_random_positions(objects, axes, center=(0, 0, 0), radius=2.0,
     
     # Normalize axes input to uppercase
     axes = [axis.upper() for axis in axes]
+    # Compare squared distances against this instead of taking a sqrt per pair
+    min_separation_sq = min_separation * min_separation
+
+    # The axes are fixed for the whole call, so pick the sampler once
+    sampler = _AXIS_SAMPLERS.get(frozenset(axes)) if len(set(axes)) == len(axes) else None
+    if sampler is None:
+        if len(axes) == 2:
+            raise ValueError(f"Invalid 2-axis combination: {axes}")
+        if len(axes) == 1:
+            raise ValueError(f"Invalid axis: {axes[0]}")
+        raise ValueError(f"Invalid number of axes: {len(axes)}. Must be 1, 2, or 3.")
     
     for obj in objects:
         attempts = 0
         while attempts < max_attempts:
-            # Initialize position at center
-            x, y, z = center
-            
-            if len(axes) == 3 and set(axes) == {"X", "Y", "Z"}:
-                # Full 3D sphere surface
-                azimuth = random.uniform(0, 2 * math.pi)
-                elevation = math.acos(random.uniform(-1, 1))
-                
-                x = center[0] + radius * math.sin(elevation) * math.cos(azimuth)
-                y = center[1] + radius * math.sin(elevation) * math.sin(azimuth)
-                z = center[2] + radius * math.cos(elevation)
-                
-            elif len(axes) == 2:
-                # 2D circle on a plane
-                angle = random.uniform(0, 2 * math.pi)
-                
-                if set(axes) == {"X", "Y"}:
-                    # XY plane (Z = center[2])
-                    x = center[0] + radius * math.cos(angle)
-                    y = center[1] + radius * math.sin(angle)
-                    z = center[2]
-                elif set(axes) == {"X", "Z"}:
-                    # XZ plane (Y = center[1])
-                    x = center[0] + radius * math.cos(angle)
-                    y = center[1]
-                    z = center[2] + radius * math.sin(angle)
-                elif set(axes) == {"Y", "Z"}:
-                    # YZ plane (X = center[0])
-                    x = center[0]
-                    y = center[1] + radius * math.cos(angle)
-                    z = center[2] + radius * math.sin(angle)
-                else:
-                    raise ValueError(f"Invalid 2-axis combination: {axes}")
-                    
-            elif len(axes) == 1:
-                # 1D line along a single axis
-                # Generate random point on line segment of length 2*radius
-                offset = random.uniform(-radius, radius)
-                
-                if axes[0] == "X":
-                    x = center[0] + offset
-                    y = center[1]
-                    z = center[2]
-                elif axes[0] == "Y":
-                    x = center[0]
-                    y = center[1] + offset
-                    z = center[2]
-                elif axes[0] == "Z":
-                    x = center[0]
-                    y = center[1]
-                    z = center[2] + offset
-                else:
-                    raise ValueError(f"Invalid axis: {axes[0]}")
-            else:
-                raise ValueError(f"Invalid number of axes: {len(axes)}. Must be 1, 2, or 3.")
+            x, y, z = sampler(center, radius)
             
             # Apply threshold snapping - set small deviations to zero
             if abs(x - center[0]) < threshold:
@@ -99,12 +110,10 @@ def generate_random_positions(objects, axes, center=(0, 0, 0), radius=2.0,
             # Check if this position is far enough from all existing objects
             valid_position = True
             for existing_pos in placed_positions:
-                distance_between = math.sqrt(
-                    (x - existing_pos[0])**2 + 
-                    (y - existing_pos[1])**2 + 
-                    (z - existing_pos[2])**2
-                )
-                if distance_between < min_separation:
+                dx = x - existing_pos[0]
+                dy = y - existing_pos[1]
+                dz = z - existing_pos[2]
+                if dx*dx + dy*dy + dz*dz < min_separation_sq:
                     valid_position = False
                     break
             
@@ -117,13 +126,82 @@ def generate_random_positions(objects, axes, center=(0, 0, 0), radius=2.0,
         
         # If we couldn't place the object after max_attempts, place it anyway with a warning
         if obj not in positioned_objects:
-            logger.info(f"Warning: Could not find non-intersecting position for {obj} after {max_attempts} attempts")
+            logger.info("Warning: Could not find non-intersecting position for %s after %d attempts", obj, max_attempts)
             positioned_objects[obj] = new_position
             placed_positions.append(new_position)
     
     return positioned_objects
 
 
+def _random_offsets(axes_mask, shape, radius, rng):
+    """
+    Random offsets from the center for a batch of objects. axes_mask broadcasts against shape + (3,),
+    with 1 on the free axes: 3 or 2 free axes give a point on the sphere / circle of the given radius,
+    a single free axis a point on the segment [-radius, radius].
+    """
+    directions = rng.standard_normal(shape + (3,)) * axes_mask
+    on_sphere = radius * directions / np.linalg.norm(directions, axis=-1, keepdims=True)
+    on_line = rng.uniform(-radius, radius, shape + (1,)) * axes_mask
+    return np.where(axes_mask.sum(-1, keepdims=True) == 1, on_line, on_sphere)
+
+
+def generate_random_positions_batch(objects_per_task, axes_per_task, center=(0, 0, 0), radius=2.0,
+                                    min_separation=1.4, max_attempts=1000, threshold=0.3, rng=None):
+    """
+    Same placement as generate_random_positions, for many tasks at once: the first candidate of every
+    object in every task is drawn in one vectorized call, and only objects that collide are redrawn,
+    with all of their remaining attempts drawn and distance-checked in one go.
+    Every task must have the same number of objects. Returns one {object: (x, y, z)} dict per task.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    if not objects_per_task:
+        return []
+
+    num_objects = len(objects_per_task[0])
+    masks = []
+    for axes in axes_per_task:
+        axes = [axis.upper() for axis in axes]
+        if len(axes) not in (1, 2, 3):
+            raise ValueError(f"Invalid number of axes: {len(axes)}. Must be 1, 2, or 3.")
+        if len(set(axes)) != len(axes) or not set(axes) <= {"X", "Y", "Z"}:
+            raise ValueError(f"Invalid axis combination: {axes}")
+        masks.append([float(axis in axes) for axis in ("X", "Y", "Z")])
+    masks = np.array(masks)[:, None, :]
+
+    center = np.asarray(center, dtype=float)
+    offsets = _random_offsets(masks, (len(objects_per_task), num_objects), radius, rng)
+    # Apply threshold snapping - set small deviations to zero - to every first candidate at once
+    first_positions = center + np.where(np.abs(offsets) < threshold, 0.0, offsets)
+    min_separation_sq = min_separation * min_separation
+
+    positioned_per_task = []
+    placed = np.empty((num_objects, 3))
+    for task_idx, objects in enumerate(objects_per_task):
+        positioned_objects = {}
+        for obj_idx, obj in enumerate(objects):
+            position = first_positions[task_idx, obj_idx]
+
+            # Check if this position is far enough from all existing objects
+            if obj_idx and (((placed[:obj_idx] - position) ** 2).sum(-1) < min_separation_sq).any():
+                # Draw the remaining attempts at once and take the first one that clears every placed object
+                candidates = _random_offsets(masks[task_idx, 0], (max_attempts - 1,), radius, rng)
+                candidates = center + np.where(np.abs(candidates) < threshold, 0.0, candidates)
+                clear = (((candidates[:, None, :] - placed[:obj_idx]) ** 2).sum(-1) >= min_separation_sq).all(-1)
+                if clear.any():
+                    position = candidates[clear.argmax()]
+                else:
+                    logger.info("Warning: Could not find non-intersecting position for %s after %d attempts", obj, max_attempts)
+                    if len(candidates):
+                        position = candidates[-1]
+
+            positioned_objects[obj] = tuple(position.tolist())
+            placed[obj_idx] = position
+        positioned_per_task.append(positioned_objects)
+
+    return positioned_per_task
+
+
 def sample_random_shapes(num_shapes=2, available_shapes=None):
     if available_shapes is None:
         available_shapes = ['cube', 'sphere', 'cone', 'cylinder']
@@ -137,6 +215,23 @@ def sample_random_shapes(num_shapes=2, available_shapes=None):
     return sampled_shapes
 
 
+@lru_cache(maxsize=8)
+def _index_gltf_dir(gltf_base_dir, mtime_ns):
+    # mtime_ns is part of the cache key so adding or removing models invalidates the index
+    objects_by_category = {}
+    for filename in os.listdir(gltf_base_dir):
+        if not filename.endswith('.gltf'):
+            continue
+        # Remove the .gltf extension to get object_id
+        object_id = filename[:-5]
+        
+        # Check if object_id follows the expected format (category_id)
+        category_code, sep, _ = object_id.partition('_')
+        if sep:
+            objects_by_category.setdefault(category_code, []).append(object_id)
+    return {category_code: tuple(object_ids) for category_code, object_ids in objects_by_category.items()}
+
+
 def sample_random_objects(gltf_base_dir, categories, num_objects=2):
     """
     Sample one object ID randomly from each category in the gltf_base_dir.
@@ -159,33 +254,16 @@ def sample_random_objects(gltf_base_dir, categories, num_objects=2):
     # Convert categories to strings for comparison
     category_strs = [str(cat) for cat in categories]
     
-    # Find all GLTF files in the directory
-    all_files = []
+    # Object ids grouped by category code, re-read only when the directory changes
     try:
-        for filename in os.listdir(gltf_base_dir):
-            if filename.endswith('.gltf'):
-                all_files.append(filename)
+        objects_by_category = _index_gltf_dir(gltf_base_dir, os.stat(gltf_base_dir).st_mtime_ns)
     except FileNotFoundError:
-        logger.error(f"Directory not found: {gltf_base_dir}")
+        logger.error("Directory not found: %s", gltf_base_dir)
         return []
     except Exception as e:
-        logger.error(f"Error reading directory {gltf_base_dir}: {str(e)}")
+        logger.error("Error reading directory %s: %s", gltf_base_dir, e)
         return []
     
-    # Group files by category codes
-    objects_by_category = {}
-    for filename in all_files:
-        # Remove the .gltf extension to get object_id
-        object_id = filename.replace('.gltf', '')
-        
-        # Check if object_id follows the expected format (category_id)
-        if '_' in object_id:
-            category_code = object_id.split('_')[0]
-            if category_code in category_strs:
-                if category_code not in objects_by_category:
-                    objects_by_category[category_code] = []
-                objects_by_category[category_code].append(object_id)
-    
     # Check if we have objects for all requested categories
     missing_categories = []
     for category_str in category_strs:
@@ -193,7 +271,7 @@ def sample_random_objects(gltf_base_dir, categories, num_objects=2):
             missing_categories.append(category_str)
     
     if missing_categories:
-        logger.warning(f"No objects found for categories {missing_categories} in {gltf_base_dir}")
+        logger.warning("No objects found for categories %s in %s", missing_categories, gltf_base_dir)
         return []
     
     # Sample one object from each category
@@ -203,6 +281,6 @@ def sample_random_objects(gltf_base_dir, categories, num_objects=2):
         sampled_object = random.choice(available_objects)
         sampled_objects.append(sampled_object)
     
-    logger.info(f"Sampled {len(sampled_objects)} objects (one from each category {categories}): {sampled_objects}")
+    logger.info("Sampled %d objects (one from each category %s): %s", len(sampled_objects), categories, sampled_objects)
     
     return sampled_objects
\ No newline at end of file
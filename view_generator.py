@@ -1,35 +1,96 @@
 import math
-from mathutils import Vector
+import numpy as np
+from functools import lru_cache
 from typing import List, Tuple, Dict, Optional
 
 
+@lru_cache(maxsize=32)
+def _sphere_offsets(camera_distance: float, azimuths: Tuple[float, ...], elevations: Tuple[float, ...],
+                    paired: bool) -> Tuple[Tuple[Tuple[float, float, float], Tuple[float, float, float]], ...]:
+    """
+    (offset from the scene center, camera rotation) for azimuth/elevation angles in degrees, computed in
+    one vectorized pass: the elevation-major grid of every pair, or azimuths[i] with elevations[i] if paired.
+    """
+    θ = np.radians(azimuths)
+    φ = np.radians(elevations)
+    if not paired:
+        θ, φ = np.broadcast_arrays(θ[None, :], φ[:, None])
+    # spherical → Cartesian
+    d_sin_φ = camera_distance * np.sin(φ)
+    offsets = np.stack([d_sin_φ * np.cos(θ), d_sin_φ * np.sin(θ), camera_distance * np.cos(φ)], axis=-1)
+    offsets = offsets.reshape(-1, 3)
+    return tuple(zip(map(tuple, offsets.tolist()), _look_at_rotations(offsets)))
+
+
+@lru_cache(maxsize=32)
+def _circle_offsets(num_angles: int, camera_distance: float, elevation: float,
+                    angles: Tuple[int, ...]) -> Tuple[Tuple[Tuple[float, float, float], Tuple[float, float, float]], ...]:
+    """(offset from the scene center, camera rotation) for the given indices of num_angles steps around Z."""
+    θ = np.asarray(angles) / num_angles * math.pi * 2
+    offsets = np.stack([np.cos(θ) * camera_distance, np.sin(θ) * camera_distance,
+                        np.full(len(angles), camera_distance * elevation)], axis=-1)
+    return tuple(zip(map(tuple, offsets.tolist()), _look_at_rotations(offsets)))
+
+
+def _look_at_rotation(ox: float, oy: float, oz: float) -> Tuple[float, float, float]:
+    """
+    XYZ Euler rotation of a camera at offset (ox, oy, oz) from the point it looks at, with -Z
+    pointing at that point and Y kept upright (the orientation of to_track_quat('-Z', 'Y')).
+    """
+    horizontal = math.hypot(ox, oy)
+    if horizontal <= 1e-9 * abs(oz):
+        # (numerically) straight above keeps the default roll, straight below flips the camera over;
+        # sin(180°) isn't exactly 0, so the bottom of a sphere grid lands here too
+        return (0.0, 0.0, 0.0) if oz >= 0 else (math.pi, 0.0, math.pi)
+    return (math.atan2(horizontal, oz), 0.0, math.atan2(ox, -oy))
+
+
+def _look_at_rotations(offsets: np.ndarray) -> Tuple[Tuple[float, float, float], ...]:
+    """_look_at_rotation for an (N, 3) array of offsets, in one vectorized pass."""
+    ox, oy, oz = offsets.T
+    horizontal = np.hypot(ox, oy)
+    # straight above / below, same cases as _look_at_rotation
+    vertical = horizontal <= 1e-9 * np.abs(oz)
+    below = vertical & (oz < 0)
+    rx = np.where(vertical, np.where(below, math.pi, 0.0), np.arctan2(horizontal, oz))
+    rz = np.where(vertical, np.where(below, math.pi, 0.0), np.arctan2(ox, -oy))
+    return tuple(zip(rx.tolist(), [0.0] * len(rx), rz.tolist()))
+
+
+# Front/side/top cameras: name, unit offset from the scene center, visible axes
+_ORTHO_VIEWS = (
+    ('front', (0.0, -1.0, 0.0), ('X', 'Z')),
+    ('side',  (1.0, 0.0, 0.0),  ('Y', 'Z')),
+    ('top',   (0.0, 0.0, 1.0),  ('X', 'Y')),
+)
+
+
 class ViewGenerator:
     def __init__(
         self,
         scene_center: Tuple[float, float, float] = (0, 0, 0),
         camera_distance: float = 5.0
     ):
-        self.scene_center = Vector(scene_center)
+        self.scene_center = tuple(map(float, scene_center))
         self.camera_distance = camera_distance
 
-    def _compute_rotation(self, cam_loc: Vector) -> Tuple[float, float, float]:
-        direction = self.scene_center - cam_loc
-        quat = direction.to_track_quat('-Z', 'Y')
-        e = quat.to_euler()
-        return (e.x, e.y, e.z)
-
     def _make_view(
         self,
         name: str,
-        cam_loc: Vector,
-        visible_axes: List[str]
+        offset: Tuple[float, float, float],
+        visible_axes: List[str],
+        rotation: Optional[Tuple[float, float, float]] = None
     ) -> Dict:
-        """Pack position+rotation into the dict format."""
-        rot = self._compute_rotation(cam_loc)
+        """
+        Pack position+rotation into the dict format; offset is the camera position relative to the scene center.
+        rotation is computed from the offset unless it is passed in precomputed.
+        """
+        cx, cy, cz = self.scene_center
+        ox, oy, oz = offset
         return {
             'name':         name,
-            'position':     (cam_loc.x, cam_loc.y, cam_loc.z),
-            'rotation':     rot,
+            'position':     (cx + ox, cy + oy, cz + oz),
+            'rotation':     rotation if rotation is not None else _look_at_rotation(ox, oy, oz),
             'visible_axes': visible_axes
         }
 
@@ -43,15 +104,10 @@ class ViewGenerator:
         if angles_to_render is None:
             angles_to_render = list(range(num_angles))
 
+        offsets = _circle_offsets(num_angles, self.camera_distance, elevation, tuple(angles_to_render))
         views = []
-        for i in angles_to_render:
-            frac = i / num_angles
-            θ = frac * math.pi * 2
-            x = math.cos(θ) * self.camera_distance
-            y = math.sin(θ) * self.camera_distance
-            z = self.camera_distance * elevation
-            loc = self.scene_center + Vector((x, y, z))
-            views.append(self._make_view(f'circle_{i:02d}', loc, ['X','Y','Z']))
+        for i, (offset, rotation) in zip(angles_to_render, offsets):
+            views.append(self._make_view(f'circle_{i:02d}', offset, ['X','Y','Z'], rotation))
         return views
 
     def spherical(
@@ -59,9 +115,23 @@ class ViewGenerator:
         num_azimuth: int = 8,
         num_elevation: int = 4,
         azimuths: Optional[List[float]] = None,
-        elevations: Optional[List[float]] = None
+        elevations: Optional[List[float]] = None,
+        paired: bool = False
     ) -> List[Dict]:
-        """Full-sphere sampling via (azimuth, elevation)."""
+        """
+        Full-sphere sampling via (azimuth, elevation).
+        If paired, azimuths[i] goes with elevations[i] instead of the full grid.
+        """
+        if paired:
+            if azimuths is None or elevations is None or len(azimuths) != len(elevations):
+                raise ValueError("paired mode needs azimuths and elevations of equal length")
+            offsets = _sphere_offsets(self.camera_distance, tuple(azimuths), tuple(elevations), True)
+            views = []
+            for deg_az, deg_el, (offset, rotation) in zip(azimuths, elevations, offsets):
+                # keep decimals so nearby jittered views get distinct names
+                name = f'sphere_az{deg_az:.2f}_el{deg_el:.2f}'
+                views.append(self._make_view(name, offset, ['X', 'Y', 'Z'], rotation))
+            return views
 
         if azimuths is None:
             azimuths = [i * 360.0 / num_azimuth for i in range(num_azimuth)]
@@ -69,33 +139,22 @@ class ViewGenerator:
             # note: num_elevation−1 so you hit 0° and 180° exactly
             elevations = [i * 180.0 / (num_elevation - 1) for i in range(num_elevation)]
 
-        # 2) convert degrees → radians for math.sin/cos
-        az_rad = [math.radians(deg) for deg in azimuths]
-        el_rad = [math.radians(deg) for deg in elevations]
-
+        offsets = iter(_sphere_offsets(self.camera_distance, tuple(azimuths), tuple(elevations), False))
         views = []
-        for deg_el, φ in zip(elevations, el_rad):
-            for deg_az, θ in zip(azimuths, az_rad):
-                # spherical → Cartesian
-                x = self.camera_distance * math.sin(φ) * math.cos(θ)
-                y = self.camera_distance * math.sin(φ) * math.sin(θ)
-                z = self.camera_distance * math.cos(φ)
-
-                loc = self.scene_center + Vector((x, y, z))
+        for deg_el in elevations:
+            for deg_az in azimuths:
                 name = f'sphere_az{int(deg_az):03d}_el{int(deg_el):03d}'
 
-                views.append(self._make_view(name, loc, ['X', 'Y', 'Z']))
+                offset, rotation = next(offsets)
+                views.append(self._make_view(name, offset, ['X', 'Y', 'Z'], rotation))
 
         return views
 
     def orthographic(self) -> List[Dict]:
         """Front/side/top fixed views."""
-        SC, D = self.scene_center, self.camera_distance
-        return [
-            self._make_view('front', SC + Vector((0, -D, 0)), ['X', 'Z']),
-            self._make_view('side',  SC + Vector((D, 0, 0)), ['Y', 'Z']),
-            self._make_view('top',   SC + Vector((0, 0, D)),  ['X', 'Y']),
-        ]
+        D = self.camera_distance
+        return [self._make_view(name, (D * ux, D * uy, D * uz), list(axes))
+                for name, (ux, uy, uz), axes in _ORTHO_VIEWS]
 
     def generate(
         self,
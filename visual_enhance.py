@@ -3,10 +3,53 @@ import mathutils
 from mathutils import Vector, Matrix
 import math
 import logging
+import numpy as np
+from create_primitives import get_template
 
 logger = logging.getLogger("visual_enhance")
 
 
+# (shape, parameters, material name) -> mesh datablock shared by every object drawn with it
+_SHARED_MESHES = {}
+
+
+def _shared_mesh(shape, material, **params):
+    """Mesh of the template geometry with material applied, created once and reused by every object that needs it."""
+    key = (shape, tuple(sorted(params.items())), material.name if material else None)
+    mesh = _SHARED_MESHES.get(key)
+    if mesh is not None:
+        try:
+            mesh.name  # raises ReferenceError once the mesh has been purged (e.g. by empty_scene)
+            return mesh
+        except ReferenceError:
+            del _SHARED_MESHES[key]
+    mesh = bpy.data.meshes.new(f"{shape.capitalize()}_Mesh")
+    get_template(shape, **params).to_mesh(mesh)
+    if material:
+        mesh.materials.append(material)
+    _SHARED_MESHES[key] = mesh
+    return mesh
+
+
+def _overlay_collection():
+    """Collection the coordinate overlays and grids are linked into, created under the scene on first use."""
+    collection = bpy.data.collections.get("VizWidgets")
+    if collection is None:
+        collection = bpy.data.collections.new("VizWidgets")
+    scene_root = bpy.context.scene.collection
+    if scene_root.children.get(collection.name) is None:
+        scene_root.children.link(collection)
+    return collection
+
+
+def _new_object(name, mesh, matrix_world):
+    """Link an object using mesh into the overlay collection without going through bpy.ops."""
+    obj = bpy.data.objects.new(name, mesh)
+    obj.matrix_world = matrix_world
+    _overlay_collection().objects.link(obj)
+    return obj
+
+
 def add_coordinate_axes(scene_center, axis_length=1.0, axis_thickness=0.02, 
                         visible_axes=["X", "Y", "Z"], materials=None):
     """
@@ -20,52 +63,27 @@ def add_coordinate_axes(scene_center, axis_length=1.0, axis_thickness=0.02,
     cone_radius = axis_thickness * 3  # Cone radius relative to axis thickness
     cylinder_length = axis_length - cone_height  # Adjust cylinder length to account for cone
     
-    # Create cylinder and cone for each axis with correct orientations
+    # Create one arrow (cylinder shaft + cone head) for each axis with correct orientations
     # X = Red = Width (left/right), Y = Green = Depth (front/back), Z = Blue = Height (up/down)
-    all_axes_data = {
-        # X-axis: Red cylinder along X direction (left-right/width)
-        'X': ((cylinder_length/2, 0, 0), (axis_length - cone_height/2, 0, 0), (0, math.radians(90), 0)),    
-        # Y-axis: Green cylinder along Y direction (front-back/depth)
-        'Y': ((0, cylinder_length/2, 0), (0, axis_length - cone_height/2, 0), (math.radians(-90), 0, 0)),     
-        # Z-axis: Blue cylinder along Z direction (up-down/height) 
-        'Z': ((0, 0, cylinder_length/2), (0, 0, axis_length - cone_height/2), (0, 0, 0))                    
+    all_axes_directions = {
+        # X-axis: Red arrow along X direction (left-right/width)
+        'X': (1.0, 0.0, 0.0),
+        # Y-axis: Green arrow along Y direction (front-back/depth)
+        'Y': (0.0, 1.0, 0.0),
+        # Z-axis: Blue arrow along Z direction (up-down/height)
+        'Z': (0.0, 0.0, 1.0)
     }
+    origin = Matrix.Translation(scene_center)
     
     # Create only the visible axes
     for axis_name in visible_axes:
-        cylinder_offset, cone_offset, rotation = all_axes_data[axis_name]
-        
-        # Add cylinder (shaft of the arrow)
-        bpy.ops.mesh.primitive_cylinder_add(
-            radius=axis_thickness,
-            depth=cylinder_length,
-            location=(
-                scene_center.x + cylinder_offset[0],
-                scene_center.y + cylinder_offset[1], 
-                scene_center.z + cylinder_offset[2]
-            ),
-            rotation=rotation
-        )
-        
-        cylinder_obj = bpy.context.object
-        cylinder_obj.name = f"Axis_{axis_name}_Cylinder"
-        cylinder_obj.data.materials.append(materials[axis_name])
-        
-        # Add cone (arrowhead)
-        bpy.ops.mesh.primitive_cone_add(
-            radius1=cone_radius,
-            depth=cone_height,
-            location=(
-                scene_center.x + cone_offset[0],
-                scene_center.y + cone_offset[1],
-                scene_center.z + cone_offset[2]
-            ),
-            rotation=rotation
-        )
-        
-        cone_obj = bpy.context.object
-        cone_obj.name = f"Axis_{axis_name}_Cone"
-        cone_obj.data.materials.append(materials[axis_name])
+        # 8 sides, like the grid lines: the arrows are only a few pixels thick in the renders
+        arrow_mesh = _shared_mesh('arrow', materials[axis_name], vertices=8,
+                                  radius=axis_thickness, depth=cylinder_length,
+                                  head_radius=cone_radius, head_depth=cone_height)
+        # The arrow starts at the origin and points along Z; turn it onto the axis
+        _new_object(f"Axis_{axis_name}_Arrow", arrow_mesh,
+                    origin @ _AXIS_ROTATIONS[all_axes_directions[axis_name]])
 
 
 def add_origin_marker(scene_center, marker_size=0.05):
@@ -73,21 +91,34 @@ def add_origin_marker(scene_center, marker_size=0.05):
     Add a small sphere at the coordinate system origin for clear reference.
     scene_center: Vector
     """
-    bpy.ops.mesh.primitive_uv_sphere_add(
-        radius=marker_size,
-        location=(scene_center.x, scene_center.y, scene_center.z)
-    )
-    
-    origin_obj = bpy.context.object
-    origin_obj.name = "Origin_Marker"
+    # Bright yellow, high emission material for origin
+    origin_mat = _overlay_material("Origin_Material", (1.0, 1.0, 0.0, 1.0), 2.0)
     
-    # Create bright material for origin
-    origin_mat = bpy.data.materials.new(name="Origin_Material")
-    origin_mat.use_nodes = True
-    bsdf = origin_mat.node_tree.nodes["Principled BSDF"]
-    bsdf.inputs[0].default_value = (1.0, 1.0, 0.0, 1.0)  # Yellow
-    bsdf.inputs[21].default_value = 2.0  # High emission
-    origin_obj.data.materials.append(origin_mat)
+    # 12 longitude segments, 8 latitude rings; plenty for a marker this small
+    origin_mesh = _shared_mesh('sphere', origin_mat, segments=12, ring_count=8, radius=marker_size)
+    _new_object("Origin_Marker", origin_mesh, Matrix.Translation(scene_center))
+
+
+# Material name -> material of the coordinate overlays, set up once and shared by every rig
+_OVERLAY_MATERIALS = {}
+
+
+def _overlay_material(name, color, emission):
+    """Principled BSDF material with the given base color and emission strength, created on first use."""
+    mat = _OVERLAY_MATERIALS.get(name)
+    if mat is not None:
+        try:
+            mat.name  # raises ReferenceError once the material has been purged (e.g. by empty_scene)
+            return mat
+        except ReferenceError:
+            del _OVERLAY_MATERIALS[name]
+    mat = bpy.data.materials.new(name=name)
+    mat.use_nodes = True
+    bsdf = mat.node_tree.nodes["Principled BSDF"]
+    bsdf.inputs[0].default_value = color
+    bsdf.inputs[21].default_value = emission
+    _OVERLAY_MATERIALS[name] = mat
+    return mat
 
 
 def create_axes_material(visible_axes):
@@ -100,22 +131,39 @@ def create_axes_material(visible_axes):
     }
     
     for axis in visible_axes:
-        color = colors[axis]
-        mat = bpy.data.materials.new(name=f"Axis_{axis}_Material")
-        mat.use_nodes = True
-        bsdf = mat.node_tree.nodes["Principled BSDF"]
-        bsdf.inputs[0].default_value = color
-        bsdf.inputs[21].default_value = 1.0
-        materials[axis] = mat
+        materials[axis] = _overlay_material(f"Axis_{axis}_Material", colors[axis], 1.0)
     
     return materials
 
 
+# (label text, material name) -> text curve shared by every label object showing it
+_LABEL_CURVES = {}
+
+
+def _label_curve(body, material):
+    """Text datablock reading body in material, created once so its glyphs are only laid out once."""
+    key = (body, material.name)
+    curve = _LABEL_CURVES.get(key)
+    if curve is not None:
+        try:
+            curve.name  # raises ReferenceError once the curve has been purged (e.g. by empty_scene)
+            return curve
+        except ReferenceError:
+            del _LABEL_CURVES[key]
+    curve = bpy.data.curves.new(name=f"Axis_Label_{body}", type='FONT')
+    curve.body = body
+    curve.size = 0.2
+    curve.materials.append(material)
+    _LABEL_CURVES[key] = curve
+    return curve
+
+
 def create_text_label(scene_center, axis_length, visible_axes, materials,
                       label_offset_multiplier=1.15):
     """
         scene_center: Vector
     """
+    overlay_collection = _overlay_collection()
     text_objs = []
     for axis_name in visible_axes:
         # Add text label that faces the camera
@@ -124,114 +172,72 @@ def create_text_label(scene_center, axis_length, visible_axes, materials,
             scene_center.y + (axis_length * label_offset_multiplier if axis_name == 'Y' else 0),
             scene_center.z + (axis_length * label_offset_multiplier if axis_name == 'Z' else 0)
         )
-        bpy.ops.object.text_add(location=label_location)
-        text_obj = bpy.context.object
-        text_obj.name = f"Axis_Label_{axis_name}"
-        text_obj.data.body = axis_name
-        text_obj.data.size = 0.2
-        text_obj.data.materials.append(materials[axis_name])
+        text_obj = bpy.data.objects.new(f"Axis_Label_{axis_name}", _label_curve(axis_name, materials[axis_name]))
+        text_obj.location = label_location
+        overlay_collection.objects.link(text_obj)
         text_objs.append(text_obj)
     return text_objs
 
 
+# (view, axis label) -> (text X axis, text Y axis) in world space, for the view the camera is in
+_LABEL_ORIENTATIONS = {
+    # Top view (looking down) - all text should be readable from above
+    ('top', 'X'):    ((1, 0, 0), (-1, 0, 0)),
+    ('top', 'Y'):    ((-1, 0, 0), (0, -1, 0)),
+    ('top', 'Z'):    ((1, 0, 0), (0, 1, 0)),
+    # Bottom view (looking up)
+    ('bottom', 'X'): ((0, -1, 0), (-1, 0, 0)),
+    ('bottom', 'Y'): ((1, 0, 0), (0, -1, 0)),
+    ('bottom', 'Z'): ((-1, 0, 0), (0, 1, 0)),
+    # Right side view (looking from +X)
+    ('right', 'X'):  ((0, 0, 1), (0, 1, 0)),
+    ('right', 'Y'):  ((0, 1, 0), (0, 0, 1)),
+    ('right', 'Z'):  ((0, -1, 0), (0, 0, -1)),
+    # Left side view (looking from -X)
+    ('left', 'X'):   ((0, 0, -1), (0, 1, 0)),
+    ('left', 'Y'):   ((0, 0, 1), (0, -1, 0)),
+    ('left', 'Z'):   ((0, 1, 0), (0, 0, 1)),
+    # Back view (looking from +Y)
+    ('back', 'X'):   ((-1, 0, 0), (0, 0, 1)),
+    ('back', 'Y'):   ((0, 0, 1), (1, 0, 0)),
+    ('back', 'Z'):   ((-1, 0, 0), (0, 0, 1)),
+    # Front view (looking from -Y)
+    ('front', 'X'):  ((1, 0, 0), (0, 0, 1)),
+    ('front', 'Y'):  ((0, 0, 1), (-1, 0, 0)),
+    ('front', 'Z'):  ((1, 0, 0), (0, 0, 1)),
+}
+
+
 def rotate_text_labels_to_cam(text_objs, camera_pos, scene_center, visible_axes):
 
     camera_pos = Vector(camera_pos)
     scene_center = Vector(scene_center)
-    for i in range(len(visible_axes)):
-        axis_name = visible_axes[i]
-        text_obj = text_objs[i]
-        
-        label_pos = Vector(text_obj.location)
-        
+    
+    # Determine which view we're in based on camera position relative to scene center;
+    # this is the same for every label, so it's worked out once
+    scene_to_cam = camera_pos - scene_center
+    
+    # Determine the primary axis of the camera offset
+    abs_x = abs(scene_to_cam.x)
+    abs_y = abs(scene_to_cam.y) 
+    abs_z = abs(scene_to_cam.z)
+    
+    if abs_z > abs_x and abs_z > abs_y:
+        # Top/bottom view - camera is above or below (XY plane)
+        view_key = 'top' if scene_to_cam.z > 0 else 'bottom'
+    elif abs_x > abs_y and abs_x > abs_z:
+        # Side view - camera is to the left or right (YZ plane)
+        view_key = 'right' if scene_to_cam.x > 0 else 'left'
+    else:
+        # Front/back view - camera is in front or behind (XZ plane)
+        view_key = 'back' if scene_to_cam.y > 0 else 'front'
+    
+    for axis_name, text_obj in zip(visible_axes, text_objs):
         # Get camera direction (from this specific label to camera)
-        cam_direction = (camera_pos - label_pos).normalized()
+        cam_direction = (camera_pos - text_obj.location).normalized()
         
-        # Determine which view we're in based on camera position relative to scene center
-        scene_to_cam = camera_pos - scene_center
-        
-        # Determine the primary axis of the camera offset
-        abs_x = abs(scene_to_cam.x)
-        abs_y = abs(scene_to_cam.y) 
-        abs_z = abs(scene_to_cam.z)
-        
-        # Calculate individual orientation for each axis label
-        # We need different logic for each axis because they're at different positions
-        
-        if abs_z > abs_x and abs_z > abs_y:
-            # Top/bottom view - camera is above or below (XY plane)
-            if scene_to_cam.z > 0:
-                # Top view (looking down) - all text should be readable from above
-                if axis_name == 'X':
-                    cam_right = mathutils.Vector((1, 0, 0))   
-                    cam_up = mathutils.Vector((-1, 0, 0))
-                elif axis_name == 'Y':
-                    cam_right = mathutils.Vector((-1, 0, 0))
-                    cam_up = mathutils.Vector((0, -1, 0))
-                else:  # Z
-                    cam_right = mathutils.Vector((1, 0, 0))
-                    cam_up = mathutils.Vector((0, 1, 0))
-            else:
-                # Bottom view (looking up)
-                if axis_name == 'X':
-                    cam_right = mathutils.Vector((0, -1, 0))
-                    cam_up = mathutils.Vector((-1, 0, 0))
-                elif axis_name == 'Y':
-                    cam_right = mathutils.Vector((1, 0, 0))
-                    cam_up = mathutils.Vector((0, -1, 0))
-                else:  # Z
-                    cam_right = mathutils.Vector((-1, 0, 0))  
-                    cam_up = mathutils.Vector((0, 1, 0))
-                    
-        elif abs_x > abs_y and abs_x > abs_z:
-            # Side view - camera is to the left or right (YZ plane)
-            if scene_to_cam.x > 0:
-                # Right side view (looking from +X)
-                if axis_name == 'X':
-                    cam_right = mathutils.Vector((0, 0, 1))   
-                    cam_up = mathutils.Vector((0, 1, 0))      
-                elif axis_name == 'Y':
-                    cam_right = mathutils.Vector((0, 1, 0)) 
-                    cam_up = mathutils.Vector((0, 0, 1))  
-                else:  # Z
-                    cam_right = mathutils.Vector((0, -1, 0))
-                    cam_up = mathutils.Vector((0, 0, -1))  
-            else:
-                # Left side view (looking from -X)
-                if axis_name == 'X':
-                    cam_right = mathutils.Vector((0, 0, -1)) 
-                    cam_up = mathutils.Vector((0, 1, 0))   
-                elif axis_name == 'Y':
-                    cam_right = mathutils.Vector((0, 0, 1)) 
-                    cam_up = mathutils.Vector((0, -1, 0))  
-                else:  # Z
-                    cam_right = mathutils.Vector((0, 1, 0)) 
-                    cam_up = mathutils.Vector((0, 0, 1))
-                    
-        else:
-            # Front/back view - camera is in front or behind (XZ plane)
-            if scene_to_cam.y > 0:
-                # Back view (looking from +Y)
-                if axis_name == 'X':
-                    cam_right = mathutils.Vector((-1, 0, 0))  
-                    cam_up = mathutils.Vector((0, 0, 1))      
-                elif axis_name == 'Y':
-                    cam_right = mathutils.Vector((0, 0, 1))   
-                    cam_up = mathutils.Vector((1, 0, 0))      
-                else:  # Z
-                    cam_right = mathutils.Vector((-1, 0, 0))  
-                    cam_up = mathutils.Vector((0, 0, 1))      
-            else:
-                # Front view (looking from -Y)
-                if axis_name == 'X':
-                    cam_right = mathutils.Vector((1, 0, 0))   
-                    cam_up = mathutils.Vector((0, 0, 1)) 
-                elif axis_name == 'Y':
-                    cam_right = mathutils.Vector((0, 0, 1))  
-                    cam_up = mathutils.Vector((-1, 0, 0))  
-                else:  # Z
-                    cam_right = mathutils.Vector((1, 0, 0)) 
-                    cam_up = mathutils.Vector((0, 0, 1))
+        # Each axis label gets its own orientation, since they're at different positions
+        cam_right, cam_up = _LABEL_ORIENTATIONS[view_key, axis_name]
         
         # Create rotation matrix for this specific label
         rot_matrix = mathutils.Matrix((
@@ -253,41 +259,39 @@ def apply_text_rotation_by_axis(text_objs, visible_axes, rotation_angle):
     else:
         view_name = "top"
 
-    for i in range(len(visible_axes)):
-        axis_name = visible_axes[i]
-        text_obj = text_objs[i]
-        # Apply opposite rotation to maintain same appearance
-        opposite_angle = -rotation_angle
-        
+    # Apply opposite rotation to maintain same appearance; the same angle for every label
+    opposite_radians = math.radians(-rotation_angle)
+    
+    for axis_name, text_obj in zip(visible_axes, text_objs):
         # Different rotation logic based on which axis the text represents
         if view_name == 'front':
             # Front view (XZ plane) - camera rotates around Y-axis
             if axis_name == 'X':
                 # X-axis label rotates around Y-axis
-                text_obj.rotation_euler[1] -= math.radians(opposite_angle)
+                text_obj.rotation_euler[1] -= opposite_radians
             elif axis_name == 'Z':
                 # Z-axis label rotates around Y-axis
-                text_obj.rotation_euler[1] -= math.radians(opposite_angle)
+                text_obj.rotation_euler[1] -= opposite_radians
             # Y-axis is not visible in front view, so no rotation needed
                 
         elif view_name == 'side':
             # Side view (YZ plane) - camera rotates around Y-axis
             if axis_name == 'Y':
                 # Y-axis label rotates around Y-axis
-                text_obj.rotation_euler[1] -= math.radians(opposite_angle)
+                text_obj.rotation_euler[1] -= opposite_radians
             elif axis_name == 'Z':
                 # Z-axis label rotates around Y-axis
-                text_obj.rotation_euler[1] += math.radians(opposite_angle)
+                text_obj.rotation_euler[1] += opposite_radians
             # X-axis is not visible in side view, so no rotation needed
                 
         elif view_name == 'top':
             # Top view (XY plane) - camera rotates around Z-axis
             if axis_name == 'X':
                 # X-axis label rotates around Z-axis
-                text_obj.rotation_euler[2] -= math.radians(opposite_angle)
+                text_obj.rotation_euler[2] -= opposite_radians
             elif axis_name == 'Y':
                 # Y-axis label rotates around Z-axis
-                text_obj.rotation_euler[2] -= math.radians(opposite_angle)
+                text_obj.rotation_euler[2] -= opposite_radians
             # Z-axis is not visible in top view, so no rotation needed
 
 
@@ -338,6 +342,10 @@ def create_scene_3D(scene_center, axis_length=1.0, axis_thickness=0.02):
     logger.info("Axes added")
     
 
+# Grid material name -> (its session_uid, its Principled BSDF nodes), so updates skip the node tree scan
+_GRID_BSDF_NODES = {}
+
+
 def create_grid_material(color=(0.5, 0.5, 0.5), opacity=1.0):
     # Create material for grid lines if it doesn't exist
     grid_material_name = "Grid_Material"
@@ -368,16 +376,23 @@ def create_grid_material(color=(0.5, 0.5, 0.5), opacity=1.0):
             grid_material.blend_method = 'OPAQUE'
         
         grid_material.use_backface_culling = False
+        _GRID_BSDF_NODES[grid_material_name] = (grid_material.session_uid, [bsdf])
         
     else:
         grid_material = bpy.data.materials[grid_material_name]
         
         # Update color and opacity for existing material
         if grid_material.use_nodes:
-            for node in grid_material.node_tree.nodes:
-                if node.type == 'BSDF_PRINCIPLED':
-                    node.inputs['Base Color'].default_value = (*color, 1.0)
-                    node.inputs['Alpha'].default_value = opacity
+            # session_uid is never reused, so a purged and re-created material can't pick up stale nodes
+            cached = _GRID_BSDF_NODES.get(grid_material_name)
+            if cached is not None and cached[0] == grid_material.session_uid:
+                bsdf_nodes = cached[1]
+            else:
+                bsdf_nodes = [node for node in grid_material.node_tree.nodes if node.type == 'BSDF_PRINCIPLED']
+                _GRID_BSDF_NODES[grid_material_name] = (grid_material.session_uid, bsdf_nodes)
+            for node in bsdf_nodes:
+                node.inputs['Base Color'].default_value = (*color, 1.0)
+                node.inputs['Alpha'].default_value = opacity
             
             # Update blend method based on opacity
             if opacity < 1.0:
@@ -388,6 +403,14 @@ def create_grid_material(color=(0.5, 0.5, 0.5), opacity=1.0):
     return grid_material
 
 
+# View -> axis indices of its grid plane
+_GRID_PLANES = {
+    'front': (0, 2),  # Front view: XZ plane - lines parallel to X and Z axes
+    'side': (1, 2),   # Side view: YZ plane - lines parallel to Y and Z axes
+    'top': (0, 1),    # Top view: XY plane - lines parallel to X and Y axes
+}
+
+
 def create_grid_for_view(coords_center, view_name=None, grid_size=10, grid_spacing=1.0, 
                          camera_distance=5, opacity=0.3):
     grid_material = create_grid_material(opacity=opacity)
@@ -395,21 +418,9 @@ def create_grid_for_view(coords_center, view_name=None, grid_size=10, grid_spaci
     # Calculate grid extent based on camera distance
     grid_extent = max(grid_size * grid_spacing, camera_distance * 1.5)
     
-    # Create grid lines based on the view
-    if view_name == 'front':
-        # Front view: XZ plane - create lines parallel to X and Z axes
-        create_grid_lines_xz_plane(coords_center, grid_extent, grid_spacing, grid_material)
-    elif view_name == 'side':
-        # Side view: YZ plane - create lines parallel to Y and Z axes  
-        create_grid_lines_yz_plane(coords_center, grid_extent, grid_spacing, grid_material)
-    elif view_name == 'top':
-        # Top view: XY plane - create lines parallel to X and Y axes
-        create_grid_lines_xy_plane(coords_center, grid_extent, grid_spacing, grid_material)
-    else:
-        # 3D grid
-        # create_grid_lines_xz_plane(coords_center, grid_extent, grid_spacing, grid_material)
-        # create_grid_lines_yz_plane(coords_center, grid_extent, grid_spacing, grid_material)
-        create_grid_lines_xy_plane(coords_center, grid_extent, grid_spacing, grid_material)
+    # Create grid lines based on the view; anything but the 2D views gets the XY grid
+    create_grid_lines(coords_center, grid_extent, grid_spacing, grid_material,
+                      _GRID_PLANES.get(view_name, (0, 1)))
         
     # bpy.ops.export_scene.gltf(
     #     filepath="./test_grid_scene",
@@ -419,88 +430,132 @@ def create_grid_for_view(coords_center, view_name=None, grid_size=10, grid_spaci
     # )
 
 
-def create_grid_lines_xz_plane(center, extent, spacing, material, save=False):
-    """Create grid lines for XZ plane (front view)"""
-    # Lines parallel to X-axis (varying Z)
-    for i in range(-int(extent/spacing), int(extent/spacing) + 1):
-        z_pos = center.z + i * spacing
-        create_line(
-            (center.x - extent, center.y, z_pos),
-            (center.x + extent, center.y, z_pos),
-            material, f"Grid_XZ_X_{i}"
-        )
+# Rotations turning the Z-aligned template cylinder onto each axis direction; grid lines only use these
+_AXIS_ROTATIONS = {
+    (1.0, 0.0, 0.0): Matrix.Rotation(math.pi / 2, 4, 'Y'),
+    (-1.0, 0.0, 0.0): Matrix.Rotation(-math.pi / 2, 4, 'Y'),
+    (0.0, 1.0, 0.0): Matrix.Rotation(-math.pi / 2, 4, 'X'),
+    (0.0, -1.0, 0.0): Matrix.Rotation(math.pi / 2, 4, 'X'),
+    (0.0, 0.0, 1.0): Matrix.Identity(4),
+    (0.0, 0.0, -1.0): Matrix.Rotation(math.pi, 4, 'X'),
+}
+
+
+def _line_rotation(direction):
+    """4x4 rotation turning the Z-aligned template cylinder onto direction (a normalized Vector)."""
+    # Axis-aligned lines (every grid line) round to their axis; the distance check keeps
+    # diagonal directions that happen to round onto an axis out of the table
+    axis = tuple(float(round(c)) for c in direction)
+    rotation_matrix = _AXIS_ROTATIONS.get(axis)
+    if rotation_matrix is not None and (direction - Vector(axis)).length < 1e-6:
+        return rotation_matrix
     
-    # Lines parallel to Z-axis (varying X)
-    for i in range(-int(extent/spacing), int(extent/spacing) + 1):
-        x_pos = center.x + i * spacing
-        create_line(
-            (x_pos, center.y, center.z - extent),
-            (x_pos, center.y, center.z + extent),
-            material, f"Grid_XZ_Z_{i}"
-        )
+    # Default cylinder is aligned with Z-axis (0,0,1)
+    z_axis = Vector((0, 0, 1))
+    # Calculate rotation needed to align Z-axis with our direction
+    dot_product = direction.dot(z_axis)
+    if abs(dot_product) < 0.999:  # Not already aligned
+        return Matrix.Rotation(z_axis.angle(direction), 4, z_axis.cross(direction))
+    if dot_product < 0:  # Pointing in opposite direction
+        return _AXIS_ROTATIONS[(0.0, 0.0, -1.0)]  # 180 degrees around X
+    return _AXIS_ROTATIONS[(0.0, 0.0, 1.0)]
+
+
+def _grid_line_endpoints(center, extent, spacing, axis_a, axis_b):
+    """
+    Endpoints of the grid lines in the plane of axes axis_a and axis_b (0, 1, 2 for X, Y, Z) through center:
+    lines parallel to axis_a at every spacing step along axis_b, then lines parallel to axis_b.
+    Returns (starts, ends), each an (N, 3) array.
+    """
+    center = np.asarray(tuple(center), dtype=np.float64)
+    steps = np.arange(-int(extent/spacing), int(extent/spacing) + 1) * spacing
+    num_steps = len(steps)
+    starts = np.tile(center, (2 * num_steps, 1))
+    ends = starts.copy()
+    # Lines parallel to axis_a
+    starts[:num_steps, axis_a] -= extent
+    ends[:num_steps, axis_a] += extent
+    starts[:num_steps, axis_b] += steps
+    ends[:num_steps, axis_b] += steps
+    # Lines parallel to axis_b
+    starts[num_steps:, axis_b] -= extent
+    ends[num_steps:, axis_b] += extent
+    starts[num_steps:, axis_a] += steps
+    ends[num_steps:, axis_a] += steps
+    return starts, ends
+
+
+def create_grid_lines(center, extent, spacing, material, plane_axes, save=False):
+    """
+    Create grid lines for the plane of plane_axes, a pair of axis indices (0, 1, 2 for X, Y, Z):
+    (0, 2) is the XZ plane (front view), (1, 2) YZ (side view) and (0, 1) XY (top view)
+    """
+    axis_a, axis_b = plane_axes
+    plane_name = "XYZ"[axis_a] + "XYZ"[axis_b]
+    # Lines parallel to the first axis (varying the second), then lines parallel to the second
+    starts, ends = _grid_line_endpoints(center, extent, spacing, axis_a, axis_b)
+    create_grid_mesh(f"Grid_{plane_name}", starts, ends, material)
     if save:
         bpy.ops.export_scene.gltf(
-            filepath="./test_grid_XZ",
+            filepath=f"./test_grid_{plane_name}",
             use_selection=False,
             export_apply=True,
             export_format='GLTF_SEPARATE'
         )
 
 
-def create_grid_lines_yz_plane(center, extent, spacing, material, save=False):
-    """Create grid lines for YZ plane (side view)"""
-    # Lines parallel to Y-axis (varying Z)
-    for i in range(-int(extent/spacing), int(extent/spacing) + 1):
-        z_pos = center.z + i * spacing
-        create_line(
-            (center.x, center.y - extent, z_pos),
-            (center.x, center.y + extent, z_pos),
-            material, f"Grid_YZ_Y_{i}"
-        )
+def create_grid_mesh(name, starts, ends, material, radius=0.01, vertices=8):
+    """
+    Create one object holding a thin cylinder from every start to the matching end.
+    A single mesh renders like one cylinder object per line, without the per-object scene overhead.
     
-    # Lines parallel to Z-axis (varying Y)
-    for i in range(-int(extent/spacing), int(extent/spacing) + 1):
-        y_pos = center.y + i * spacing
-        create_line(
-            (center.x, y_pos, center.z - extent),
-            (center.x, y_pos, center.z + extent),
-            material, f"Grid_YZ_Z_{i}"
-        )
-    if save:
-        bpy.ops.export_scene.gltf(
-            filepath="./test_grid_YZ",
-            use_selection=False,
-            export_apply=True,
-            export_format='GLTF_SEPARATE'
-        )
-
-
-def create_grid_lines_xy_plane(center, extent, spacing, material, save=False):
-    """Create grid lines for XY plane (top view)"""
-    # Lines parallel to X-axis (varying Y)
-    for i in range(-int(extent/spacing), int(extent/spacing) + 1):
-        y_pos = center.y + i * spacing
-        create_line(
-            (center.x - extent, y_pos, center.z),
-            (center.x + extent, y_pos, center.z),
-            material, f"Grid_XY_X_{i}"
-        )
+    :param name: Name for the grid object
+    :param starts: Starting positions, one (x, y, z) per line
+    :param ends: Ending positions, one (x, y, z) per line
+    :param material: Material to apply to the grid
+    """
+    starts = np.asarray(starts, dtype=np.float64).reshape(-1, 3)
+    ends = np.asarray(ends, dtype=np.float64).reshape(-1, 3)
+    directions = ends - starts
+    lengths = np.linalg.norm(directions, axis=1)
+    centers = (starts + ends) / 2
     
-    # Lines parallel to Y-axis (varying X)
-    for i in range(-int(extent/spacing), int(extent/spacing) + 1):
-        x_pos = center.x + i * spacing
-        create_line(
-            (x_pos, center.y - extent, center.z),
-            (x_pos, center.y + extent, center.z),
-            material, f"Grid_XY_Y_{i}"
-        )
-    if save:
-        bpy.ops.export_scene.gltf(
-            filepath="./test_grid_XY",
-            use_selection=False,
-            export_apply=True,
-            export_format='GLTF_SEPARATE'
-        )
+    # Unit-length template cylinder along Z, stretched to each line's length
+    bm = get_template('cylinder', vertices=vertices, radius=radius, depth=1.0)
+    bm.verts.index_update()
+    template = np.array([v.co for v in bm.verts])
+    template_faces = [[v.index for v in face.verts] for face in bm.faces]
+    scale = np.ones((len(lengths), 1, 3))
+    scale[:, 0, 2] = lengths
+    stretched = template[None, :, :] * scale
+    
+    # Rotation taking Z onto each line's direction
+    units = directions / np.where(lengths > 0, lengths, 1.0)[:, None]
+    rotations = np.array([_line_rotation(Vector(unit)).to_3x3() for unit in units.tolist()])
+    coords = np.einsum('nij,nvj->nvi', rotations, stretched) + centers[:, None, :]
+    
+    # Every line repeats the template's faces, shifted to its own block of vertices
+    num_lines = len(starts)
+    num_template_verts = len(template)
+    template_corners = np.concatenate(template_faces)
+    corners = (template_corners[None, :] + (np.arange(num_lines) * num_template_verts)[:, None]).ravel()
+    face_sizes = np.tile([len(face) for face in template_faces], num_lines)
+    loop_starts = np.concatenate([[0], np.cumsum(face_sizes)[:-1]])
+    
+    # Upload the flat arrays straight into the mesh (polygon sizes follow from loop_start)
+    mesh = bpy.data.meshes.new(f"{name}_Mesh")
+    mesh.vertices.add(num_lines * num_template_verts)
+    mesh.vertices.foreach_set("co", coords.astype(np.float32).ravel())
+    mesh.loops.add(len(corners))
+    mesh.loops.foreach_set("vertex_index", corners.astype(np.int32))
+    mesh.polygons.add(len(loop_starts))
+    mesh.polygons.foreach_set("loop_start", loop_starts.astype(np.int32))
+    mesh.update(calc_edges=True)
+    if material:
+        mesh.materials.append(material)
+    grid_obj = _new_object(name, mesh, Matrix.Identity(4))
+    logger.info("Created grid '%s' with %d lines", name, len(starts))
+    return grid_obj
 
 
 def create_line(start_pos, end_pos, material, name):
@@ -512,9 +567,6 @@ def create_line(start_pos, end_pos, material, name):
     :param material: Material to apply to the line
     :param name: Name for the line object
     """
-
-    logger.info(f"Creating line '{name}' from {start_pos} to {end_pos}")
-
     try:
         # Calculate line properties
         start = Vector(start_pos)
@@ -523,76 +575,27 @@ def create_line(start_pos, end_pos, material, name):
         length = direction.length
         center = (start + end) / 2
         
-        logger.info(f"Line length: {length:.3f}, center: {center}")
-        
         if length < 0.001:  # Very short line
-            logger.warning(f"Line '{name}' is very short ({length:.6f}) - might not be visible")
-        
-        # Create cylinder at origin first
-        bpy.ops.mesh.primitive_cylinder_add(
-            radius=0.01,  # Thin cylinder radius
-            depth=length,
-            location=(0, 0, 0),  # Create at origin
-            vertices=8  # 8-sided cylinder
-        )
-        
-        # Get the created object (it becomes the active object)
-        line_obj = bpy.context.active_object
-        line_obj.name = name
-        
-        logger.info(f"Created cylinder object: {line_obj.name} at origin")
+            logger.warning("Line '%s' is very short (%.6f) - might not be visible", name, length)
         
         # Align the cylinder with the line direction
+        rotation_matrix = Matrix.Identity(4)
         if direction.length > 0:
             direction.normalize()
-            # Default cylinder is aligned with Z-axis (0,0,1)
-            z_axis = Vector((0, 0, 1))
-            
-            logger.debug(f"Direction vector: {direction}, Z-axis: {z_axis}")
-            
-            # Calculate rotation needed to align Z-axis with our direction
-            dot_product = direction.dot(z_axis)
-            logger.debug(f"Dot product: {dot_product:.3f}")
-            
-            if abs(dot_product) < 0.999:  # Not already aligned
-                rotation_axis = z_axis.cross(direction)
-                rotation_angle = z_axis.angle(direction)
-                logger.info(f"Rotating by {rotation_angle:.3f} radians around axis {rotation_axis}")
-                
-                # Apply rotation around origin
-                rotation_matrix = Matrix.Rotation(rotation_angle, 4, rotation_axis)
-                line_obj.matrix_world = rotation_matrix
-                
-            elif dot_product < 0:  # Pointing in opposite direction
-                logger.info("Flipping cylinder 180 degrees")
-                line_obj.rotation_euler = (3.14159, 0, 0)  # 180 degrees around X
-            else:
-                logger.info("Cylinder already aligned with direction")
+            rotation_matrix = _line_rotation(direction)
         else:
-            logger.warning(f"Zero-length direction vector for line '{name}'")
-        
-        # NOW move the cylinder to the correct center position
-        # This ensures the center is correct after rotation
-        line_obj.location = center
-        logger.info(f"Moved cylinder to final center position: {center}")
+            logger.warning("Zero-length direction vector for line '%s'", name)
         
-        # Apply material
-        if material:
-            if line_obj.data.materials:
-                line_obj.data.materials[0] = material
-                logger.info(f"Replaced existing material with {material.name}")
-            else:
-                line_obj.data.materials.append(material)
-                logger.info(f"Applied material {material.name}")
-        else:
-            logger.warning(f"No material provided for line '{name}'")
+        if not material:
+            logger.warning("No material provided for line '%s'", name)
         
-        logger.info(f"Successfully created line '{name}' with final location: {line_obj.location}")
-        logger.info(f"Final rotation: {line_obj.rotation_euler}")
+        # Thin 8-sided cylinder; lines of the same length share one mesh
+        line_mesh = _shared_mesh('cylinder', material, vertices=8, radius=0.01, depth=round(length, 6))
+        # Rotate about the cylinder's own center, then move it to the line's center
+        line_obj = _new_object(name, line_mesh, Matrix.Translation(center) @ rotation_matrix)
         
         return line_obj
         
     except Exception as e:
-        logger.error(f"Error creating line '{name}': {str(e)}")
-        logger.error(f"Start pos: {start_pos}, End pos: {end_pos}")
+        logger.error("Error creating line '%s' from %s to %s: %s", name, start_pos, end_pos, e)
         raise e
\ No newline at end of file